@@ -1,12 +1,25 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
+import time
+import queue
+import threading
+from concurrent.futures import as_completed
 from modules.data_loader import DataLoader
+from modules.dataset_cache import get_dataset_cache
+from modules.dtype_optimizer import DtypeOptimizer
 from modules.spec_parser import ChartSpecParser
-from modules.chart_generator import ChartGenerator
+from modules.spec_cache import SpecCache
+from modules.llm_handler import llm_init_seconds
+from modules.chart_generator import ChartGenerator, CHART_REGISTRY
+from modules.sample_data import generate_sample_data, DEFAULT_ROWS, DEFAULT_SEED
+from modules.dashboard_builder import DashboardBuilder
+from modules.downloads import DownloadCache, get_download_cache
+from modules.filter_engine import FilterEngine, get_filter_engine
+from modules.profiler import start_profiling, get_dataset_profile
+from modules.figure_cache import get_figure_cache
+from modules.dashboard_state import DashboardState
 # Import simple authentication UI components
 from simple_auth_ui import show_login_page, show_signup_page, show_reset_password_page
 from custom_css import get_custom_css
@@ -67,43 +80,258 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def generate_sample_data():
-    """Generate sample data for demonstration"""
-    # Create sample data
-    np.random.seed(42)
-    
-    # Generate dates
-    dates = [datetime.now() - timedelta(days=x) for x in range(100)]
-    
-    # Generate products
-    products = ['Product A', 'Product B', 'Product C', 'Product D', 'Product E']
-    
-    # Generate regions
-    regions = ['North', 'South', 'East', 'West']
-    
-    # Generate industries
-    industries = ['Technology', 'Healthcare', 'Finance', 'Retail', 'Manufacturing']
-    
-    # Generate data
-    data = []
-    for date in dates:
-        for product in products:
-            for region in regions:
-                for industry in industries:
-                    if np.random.random() > 0.7:  # Only include some combinations
-                        sales = np.random.randint(100, 1000)
-                        profit = sales * np.random.uniform(0.1, 0.3)
-                        data.append({
-                            'Date': date,
-                            'Product': product,
-                            'Region': region,
-                            'Industry': industry,
-                            'Sales': sales,
-                            'Profit': profit,
-                            'Units': np.random.randint(10, 100)
-                        })
-    
-    return pd.DataFrame(data)
+# One-click charts: (chart type, button label, widget key), shown in two rows of four
+QUICK_CHARTS = [
+    ('bar', "📈 Bar Chart", "bar_chart"),
+    ('pie', "🥧 Pie Chart", "pie_chart"),
+    ('line', "📉 Line Chart", "line_chart"),
+    ('scatter', "🔍 Scatter Plot", "scatter_plot"),
+    ('time_series', "⏱️ Time Series", "time_series"),
+    ('statistics', "📊 Statistics", "statistics"),
+    ('gauge', "🎯 Gauge", "gauge"),
+    ('table', "📋 Table", "table")
+]
+
+def render_chart(chart_spec, fig, i, cols):
+    """Render a built chart in the next layout column, returning a slot for its download button"""
+    with cols[i % len(cols)]:
+        # Add zoom and download features to the chart
+        fig.update_layout(
+            height=500,
+            width=1500,  # Increased width even more
+            margin=dict(l=20, r=20, t=40, b=20),  # Reduced side margins
+            hovermode='closest',
+            showlegend=True,
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            )
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+        return st.container()
+
+def timing_summary(result):
+    """One-line latency breakdown of a chart for the debug overlay"""
+    parts = ["reused" if result.get('reused') else f"built in {result['seconds']:.2f}s",
+             f"drawn in {result['render_seconds']:.2f}s"]
+    if 'shown_after' in result:
+        parts.append(f"shown {result['shown_after']:.2f}s after Generate")
+    return "⏱️ " + ", ".join(parts)
+
+def render_result(result, i, cols):
+    """Render one build result, or its error, recording its download slot and render time.
+
+    This is the single render path for dashboard and quick charts alike.
+    """
+    start = time.perf_counter()
+    if result['error']:
+        with cols[i % len(cols)]:
+            st.error(f"Could not build {result['spec'].get('title')}: {result['error']}")
+        result['slot'] = None
+    else:
+        result['slot'] = render_chart(result['spec'], result['figure'], i, cols)
+    result['render_seconds'] = time.perf_counter() - start
+    if st.session_state.get('show_timings'):
+        with cols[i % len(cols)]:
+            st.caption(timing_summary(result))
+
+# How often finished chart builds are drawn while the spec stream is quiet
+STREAM_POLL_SECONDS = 0.1
+MAX_LAYOUT_COLUMNS = 6
+
+def layout_size(layout, key, default, maximum=None):
+    """Read a row or column count from a possibly unvalidated layout as a positive int"""
+    try:
+        value = int(layout.get(key) or default)
+    except (TypeError, ValueError):
+        value = default
+    value = max(1, value)
+    return min(value, maximum) if maximum else value
+
+def poll_events(events, interval):
+    """Yield the events of a blocking iterator, and None every interval seconds while it is quiet.
+
+    The iterator is consumed on a helper thread, so the script thread can do
+    other work (such as drawing finished charts) between events. Errors are
+    re-raised on the script thread.
+    """
+    inbox = queue.Queue()
+    finished = object()
+
+    def pump():
+        try:
+            for event in events:
+                inbox.put(event)
+        except Exception as e:
+            inbox.put(e)
+        inbox.put(finished)
+
+    threading.Thread(target=pump, daemon=True).start()
+    while True:
+        try:
+            item = inbox.get(timeout=interval)
+        except queue.Empty:
+            yield None
+            continue
+        if item is finished:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+def reserve_slots(layout):
+    """Lay out an empty placeholder per grid cell before any chart is built.
+
+    Returns the slot grid: placeholders keyed by the chart title the layout
+    puts there, plus the remaining cells in reading order for charts the
+    layout does not place.
+    """
+    # Streamed layouts are not validated yet, so sizes are clamped and malformed positions skipped
+    n_cols = layout_size(layout, 'columns', 2, MAX_LAYOUT_COLUMNS)
+    positions = [
+        p for p in layout.get('chart_positions') or []
+        if isinstance(p, dict) and isinstance(p.get('row'), int) and isinstance(p.get('column'), int)
+    ]
+    n_rows = max([layout_size(layout, 'rows', 1)] + [p['row'] for p in positions])
+    cells = {}
+    for position in positions:
+        cell = (position['row'] - 1, position['column'] - 1)
+        if position.get('chart') and cell[0] >= 0 and 0 <= cell[1] < n_cols and cell not in cells.values():
+            cells.setdefault(position['chart'], cell)
+
+    grid = {'columns': n_cols, 'placed': {}, 'free': []}
+    for row in range(n_rows):
+        for col, column in enumerate(st.columns(n_cols)):
+            slot = column.empty()
+            title = next((title for title, cell in cells.items() if cell == (row, col)), None)
+            if title is None:
+                grid['free'].append(slot)
+            else:
+                slot.info(f"Building {title}…")
+                grid['placed'][title] = slot
+    return grid
+
+def take_slot(grid, title):
+    """Claim the placeholder for a chart, opening a new row once the grid is full"""
+    slot = grid['placed'].pop(title, None)
+    if slot is None:
+        if not grid['free']:
+            grid['free'] = [column.empty() for column in st.columns(grid['columns'])]
+        slot = grid['free'].pop(0)
+        slot.info(f"Building {title}…")
+    return slot
+
+def fill_slot(result, slot, started):
+    """Draw a finished build into its reserved placeholder"""
+    result['shown_after'] = time.perf_counter() - started
+    render_result(result, 0, [slot.container()])
+
+def render_timings(rendered, usage=None):
+    """Debug overlay table of per-chart latency, with the spec request's token usage if one was made"""
+    if not st.session_state.get('show_timings') or not rendered:
+        return
+    with st.expander("Chart timings", expanded=True):
+        init_seconds = llm_init_seconds()
+        if init_seconds is not None:
+            st.caption(f"LLM client initialized once per process in {init_seconds:.3f}s")
+        if usage is not None:
+            estimated = " (estimated)" if usage['estimated'] else ""
+            st.caption(f"Spec request: {usage['prompt_tokens']:,} prompt + "
+                       f"{usage['response_tokens']:,} response tokens{estimated} in {usage['seconds']:.2f}s")
+        st.dataframe(pd.DataFrame([{
+            'chart': result['spec'].get('title'),
+            'build (s)': None if result.get('reused') else round(result['seconds'], 3),
+            'draw (s)': round(result['render_seconds'], 3),
+            'shown after (s)': round(result['shown_after'], 3) if 'shown_after' in result else None
+        } for result in rendered]), use_container_width=True)
+
+def render_download_controls(rendered, spec, key_prefix=""):
+    """Offer chart downloads, plus a whole-dashboard bundle when a dashboard spec is given.
+
+    Each HTML payload is only rendered once it is asked for.
+    """
+    prepared = st.session_state.setdefault('prepared_downloads', set())
+    download_cache = get_download_cache()
+    built = [result for result in rendered if result['figure'] is not None]
+    for i, result in enumerate(built):
+        chart_title = result['spec'].get('title', f"Chart {i+1}")
+        with result['slot']:
+            if result['key'] in prepared:
+                st.download_button(
+                    label=f"Download {chart_title}",
+                    data=download_cache.chart_html(result['key'], result['figure']),
+                    file_name=f"{chart_title.replace(' ', '_').lower()}.html",
+                    mime="text/html",
+                    key=f"{key_prefix}download_{i}"
+                )
+            else:
+                st.button(f"Prepare download of {chart_title}", key=f"{key_prefix}prepare_{i}",
+                          on_click=prepared.add, args=(result['key'],))
+
+    if built and spec is not None:
+        dashboard_title = spec.get('dashboard_title') or "Dashboard"
+        bundle_key = DownloadCache.dashboard_key([result['key'] for result in built])
+        if bundle_key in prepared:
+            st.download_button(
+                label="Download whole dashboard",
+                data=download_cache.dashboard_html(
+                    dashboard_title, [(result['key'], result['figure']) for result in built]
+                ),
+                file_name=f"{dashboard_title.replace(' ', '_').lower()}.html",
+                mime="text/html",
+                key="download_dashboard"
+            )
+        else:
+            st.button("Prepare whole dashboard download", key="prepare_dashboard",
+                      on_click=prepared.add, args=(bundle_key,))
+
+def resolve_charts(state, data, chart_specs, prefix):
+    """Return build results for chart_specs, rebuilding only the charts whose spec or data changed.
+
+    Each chart is its own state node, named by prefix and position, whose
+    input is the chart's figure cache key.
+    """
+    cache = get_figure_cache()
+    names = [f"{prefix}{i}" for i in range(len(chart_specs))]
+    inputs = [{'figure': cache.make_key(data, chart_spec)} for chart_spec in chart_specs]
+    stale = [i for i, name in enumerate(names) if not state.is_current(name, inputs[i])]
+    if stale:
+        built = DashboardBuilder().build_all(data, [chart_specs[i] for i in stale])
+        for i, result in zip(stale, built):
+            state.set(names[i], inputs[i], result)
+    state.prune(prefix, keep=names)
+    # Copies, so render slots are not kept in the session
+    results = [dict(state.get(name)) for name in names]
+    for i, result in enumerate(results):
+        result['reused'] = i not in stale
+    return results
+
+def render_filters(df, fields, profile):
+    """Draw sidebar filters for the dashboard's filter fields and return the filtered rows"""
+    filter_engine = get_filter_engine(df)
+    fields = [field for field in fields if field in df.columns]
+    if fields:
+        st.sidebar.header("Filters")
+    selections = {}
+    for field in fields:
+        # The profile's distinct count rules out huge columns before any index is built
+        options = None
+        if profile['columns'][field]['n_unique'] <= FilterEngine.MAX_OPTIONS:
+            options = filter_engine.options(field)
+        if options is None:
+            st.sidebar.caption(f"{field} has too many distinct values to filter on")
+            continue
+        selections[field] = st.sidebar.multiselect(
+            f"Select {field}",
+            options=options,
+            default=options,
+            key=f"filter_{field}"
+        )
+    return filter_engine.apply(selections)
 
 def main():
     if not st.session_state['authenticated']:
@@ -122,6 +350,9 @@ def main():
             st.session_state['user'] = None
             st.rerun()
 
+    # Values that survive reruns, each recomputed only when its inputs change
+    state = DashboardState(st.session_state)
+
     # Sidebar with app info
     with st.sidebar:
         st.image("https://img.icons8.com/color/96/000000/dashboard.png", width=80)
@@ -140,6 +371,9 @@ def main():
         - Specify chart types and data fields
         - Try different chart combinations
         """)
+        st.markdown("---")
+        st.checkbox("Show chart timings", key="show_timings",
+                    help="Overlay build and draw latency on each chart")
     
     # Main content
     st.markdown("<h1 style='text-align: center;'>📊 AI Dashboard Generator</h1>", unsafe_allow_html=True)
@@ -180,26 +414,57 @@ def main():
             
             if uploaded_file is not None:
                 try:
-                    # Load data
+                    # Load data once per upload, reusing the columnar copy from earlier sessions
                     data_loader = DataLoader()
-                    df = data_loader.load_data(uploaded_file)
+                    upload_inputs = {
+                        'source': 'upload',
+                        'name': uploaded_file.name,
+                        'size': uploaded_file.size,
+                        'file_id': getattr(uploaded_file, 'file_id', None)
+                    }
+                    df = state.resolve('data', upload_inputs, lambda: get_dataset_cache().get_or_load(
+                        uploaded_file, data_loader.load_data
+                    ))
                     st.success("Data loaded successfully!")
+                    if df.attrs.get('cache_hit'):
+                        st.caption(f"Loaded from cache in {df.attrs['load_seconds']:.2f}s")
+                    if 'memory_report' in df.attrs:
+                        st.caption(DtypeOptimizer.format_report(df.attrs['memory_report']))
+                    if DataLoader.sample_notice(df):
+                        st.warning(DataLoader.sample_notice(df))
                 except Exception as e:
                     st.error(f"Error loading file: {str(e)}")
         else:
-            # Generate sample data
-            df = generate_sample_data()
+            # Generate sample data; the same size and seed reuse the memoized frame
+            size_col, seed_col = st.columns(2)
+            with size_col:
+                n_rows = st.number_input("Rows", min_value=10_000, max_value=100_000_000,
+                                         value=DEFAULT_ROWS, step=10_000)
+            with seed_col:
+                seed = st.number_input("Seed", min_value=0, value=DEFAULT_SEED, step=1)
+            sample_inputs = {'source': 'sample', 'rows': int(n_rows), 'seed': int(seed),
+                             'date': str(pd.Timestamp.today().date())}
+            df = state.resolve('data', sample_inputs, lambda: generate_sample_data(n_rows, seed))
             st.success("Sample data generated successfully!")
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Data preview section
+    profile = None
     if df is not None:
+        # Profile in the background while the preview renders
+        fingerprint = get_figure_cache().dataset_fingerprint(df)
+        if not state.is_current('profile', {'data': fingerprint}):
+            start_profiling(df)
         st.markdown("### Data Preview")
         st.dataframe(df.head(), use_container_width=True)
         
         # Show column names to help with specification
         st.markdown("### Available Columns")
-        st.markdown(f"<div style='background-color: rgba(255, 255, 255, 0.9); padding: 15px; border-radius: 10px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);'>{', '.join(df.columns.tolist())}</div>", unsafe_allow_html=True)
+        profile = state.resolve('profile', {'data': fingerprint}, lambda: get_dataset_profile(df))
+        column_summary = ', '.join(
+            f"{name} ({column['kind']})" for name, column in profile['columns'].items()
+        )
+        st.markdown(f"<div style='background-color: rgba(255, 255, 255, 0.9); padding: 15px; border-radius: 10px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);'>{column_summary}</div>", unsafe_allow_html=True)
     
     # Dashboard specification input
     st.markdown("## 📝 Dashboard Specification")
@@ -221,518 +486,123 @@ def main():
             st.error("Please provide a description for your dashboard!")
         else:
             try:
-                # Parse specification
+                # A new dashboard starts unfiltered
+                for key in [key for key in st.session_state if str(key).startswith('filter_')]:
+                    del st.session_state[key]
+
+                # Parse specification, reserving a placeholder per layout cell as soon as the
+                # layout is known and building each chart in the background as it streams in.
+                # Each placeholder is filled the moment its chart finishes, in any order.
+                started = time.perf_counter()
                 spec_parser = ChartSpecParser()
-                spec = spec_parser.parse_specification(spec_input)
-                
-                # Create charts based on specification
-                chart_generator = ChartGenerator()
-                
-                # Create columns for layout
-                cols = st.columns(spec['layout']['columns'])
-                
-                # Generate each chart
-                for i, chart_spec in enumerate(spec['charts']):
-                    col_idx = i % spec['layout']['columns']
-                    with cols[col_idx]:
-                        if chart_spec['type'] == 'bar':
-                            fig = chart_generator.create_bar_chart(
-                                df,
-                                chart_spec['x_field'],
-                                chart_spec['y_field'],
-                                chart_spec.get('color_field'),
-                                chart_spec['title']
-                            )
-                        elif chart_spec['type'] == 'pie':
-                            fig = chart_generator.create_pie_chart(
-                                df,
-                                chart_spec['labels_field'],
-                                chart_spec['values_field'],
-                                chart_spec['title']
-                            )
-                        elif chart_spec['type'] == 'line':
-                            fig = chart_generator.create_line_chart(
-                                df,
-                                chart_spec['x_field'],
-                                chart_spec['y_field'],
-                                chart_spec.get('color_field'),
-                                chart_spec['title']
-                            )
-                        elif chart_spec['type'] == 'scatter':
-                            fig = chart_generator.create_scatter_plot(
-                                df,
-                                chart_spec['x_field'],
-                                chart_spec['y_field'],
-                                chart_spec.get('color_field'),
-                                chart_spec.get('size_field'),
-                                chart_spec['title']
-                            )
-                        elif chart_spec['type'] == 'time_series':
-                            fig = chart_generator.create_time_series(
-                                df,
-                                chart_spec['time_field'],
-                                chart_spec['value_field'],
-                                chart_spec.get('group_field'),
-                                chart_spec['title']
-                            )
-                        elif chart_spec['type'] == 'statistics':
-                            fig = chart_generator.create_statistics(
-                                df,
-                                chart_spec['value_field'],
-                                chart_spec.get('group_field'),
-                                chart_spec['title']
-                            )
-                        elif chart_spec['type'] == 'gauge':
-                            fig = chart_generator.create_gauge(
-                                df,
-                                chart_spec['value_field'],
-                                chart_spec['title'],
-                                chart_spec.get('min_value'),
-                                chart_spec.get('max_value')
-                            )
-                        elif chart_spec['type'] == 'table':
-                            fig = chart_generator.create_table(
-                                df,
-                                chart_spec.get('columns'),
-                                chart_spec['title'],
-                                chart_spec.get('max_rows', 10)
-                            )
-                        
-                        # Add zoom and download features to the chart
-                        fig.update_layout(
-                            height=500,
-                            width=1500,  # Increased width even more
-                            margin=dict(l=20, r=20, t=40, b=20),  # Reduced side margins
-                            hovermode='closest',
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        # Add download button for each chart
-                        chart_title = chart_spec.get('title', f"Chart {i+1}")
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label=f"Download {chart_title}",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name=f"{chart_title.replace(' ', '_').lower()}.html",
-                            mime="text/html",
-                            key=f"download_{i}"
-                        )
+                builder = DashboardBuilder()
+                grid = None
+                pending = []
+                titles = []
+                slots = {}
+                spec = None
+                usage = None
+                events = poll_events(spec_parser.stream_specification(spec_input, df), STREAM_POLL_SECONDS)
+                for item in events:
+                    # Between events, still draw any chart whose build has finished
+                    event, value = item if item is not None else (None, None)
+                    if event == 'layout':
+                        grid = grid or reserve_slots(value)
+                    elif event == 'chart':
+                        grid = grid or reserve_slots({})
+                        future = builder.submit(df, value)
+                        slots[future] = take_slot(grid, value.get('title'))
+                        pending.append(future)
+                        titles.append(value.get('title'))
+                    elif event == 'usage':
+                        usage = value
+                    elif event == 'error':
+                        st.warning(f"The specification stream failed: {value}")
+                    elif event == 'spec':
+                        spec = value
+                    for future in [future for future in slots if future.done()]:
+                        fill_slot(future.result(), slots.pop(future), started)
+
+                # Charts only present in the final spec (e.g. titled after streaming)
+                grid = grid or reserve_slots(spec['layout'])
+                for chart_spec in spec['charts']:
+                    if chart_spec['title'] not in titles:
+                        future = builder.submit(df, chart_spec)
+                        slots[future] = take_slot(grid, chart_spec['title'])
+                        pending.append(future)
+                        titles.append(chart_spec['title'])
+                for future in as_completed(list(slots)):
+                    fill_slot(future.result(), slots.pop(future), started)
+                for slot in grid['placed'].values():
+                    # Layout cells whose chart never arrived
+                    slot.empty()
+                rendered = [future.result() for future in pending]
+                render_timings(rendered, usage)
+
+                # Keep the dashboard so later reruns (such as download clicks) redraw it from state
+                charts = [result['spec'] for result in rendered]
+                state.set('spec', {'columns': SpecCache.column_signature(df)}, {'spec': spec, 'charts': charts})
+                cache = get_figure_cache()
+                for i, result in enumerate(rendered):
+                    state.set(f"chart:{i}", {'figure': cache.make_key(df, result['spec'])},
+                              {key: value for key, value in result.items() if key not in ('slot', 'shown_after')})
+                state.prune('chart:', keep=[f"chart:{i}" for i in range(len(rendered))])
+                render_download_controls(rendered, spec)
                 
-                # Add filters if specified
-                if 'filters' in spec and spec['filters']:
-                    st.sidebar.header("Filters")
-                    for filter_field in spec['filters']:
-                        if filter_field in df.columns:
-                            unique_values = df[filter_field].unique()
-                            selected_values = st.sidebar.multiselect(
-                                f"Select {filter_field}",
-                                options=unique_values,
-                                default=unique_values
-                            )
+                # Filters start with every value selected, so the charts above are already current
+                render_filters(df, spec.get('filters') or [], profile)
             
             except Exception as e:
                 st.error(f"Error generating dashboard: {str(e)}")
                 st.error("Please check your data and specification format.")
                 st.error("Make sure the fields mentioned in your specification exist in your data.")
+    elif df is not None and state.is_current('spec', {'columns': SpecCache.column_signature(df)}):
+        # Redraw for any dataset with the same columns; only charts whose inputs changed are rebuilt
+        dashboard = state.get('spec')
+        filtered = render_filters(df, dashboard['spec'].get('filters') or [], profile)
+        if len(filtered) < len(df):
+            st.caption(f"Showing {len(filtered):,} of {len(df):,} rows")
+        # Same placement as when the dashboard was generated
+        grid = reserve_slots(dashboard['spec']['layout'])
+        slots = [take_slot(grid, chart_spec.get('title')) for chart_spec in dashboard['charts']]
+        for slot in grid['placed'].values():
+            slot.empty()
+        rendered = resolve_charts(state, filtered, dashboard['charts'], 'chart:')
+        for result, slot in zip(rendered, slots):
+            render_result(result, 0, [slot.container()])
+        render_timings(rendered)
+        render_download_controls(rendered, dashboard['spec'])
     
     # Quick chart generation section
     st.markdown("## 📈 Quick Chart Generation")
     st.markdown("Generate individual charts with a single click")
     
-    # Create a row of buttons for each chart type with wider spacing
-    chart_buttons = st.columns(4)
-    
-    with chart_buttons[0]:
-        if st.button("📈 Bar Chart", key="bar_chart"):
-            if df is not None:
-                try:
-                    # Get numeric columns for y-axis
-                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                    # Get categorical columns for x-axis
-                    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-                    
-                    if numeric_cols and categorical_cols:
-                        # Create a bar chart
-                        chart_generator = ChartGenerator()
-                        fig = chart_generator.create_bar_chart(
-                            df,
-                            categorical_cols[0],  # Use first categorical column as x
-                            numeric_cols[0],      # Use first numeric column as y
-                            None,                 # No color grouping
-                            f"Bar Chart: {numeric_cols[0]} by {categorical_cols[0]}"
-                        )
-                        
-                        # Add zoom and download features with wider layout
-                        fig.update_layout(
-                            height=500,
-                            width=1800,  # Increased width even more
-                            margin=dict(l=10, r=10, t=40, b=10),  # Reduced side margins even more
-                            hovermode='closest',
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        # Use full container width for the chart
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label="Download Bar Chart",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name="bar_chart.html",
-                            mime="text/html",
-                            key="download_bar"
-                        )
-                    else:
-                        st.error("Need both numeric and categorical columns for a bar chart")
-                except Exception as e:
-                    st.error(f"Error creating bar chart: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
-    
-    with chart_buttons[1]:
-        if st.button("🥧 Pie Chart", key="pie_chart"):
-            if df is not None:
-                try:
-                    # Get numeric columns for values
-                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                    # Get categorical columns for labels
-                    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-                    
-                    if numeric_cols and categorical_cols:
-                        # Create a pie chart
-                        chart_generator = ChartGenerator()
-                        fig = chart_generator.create_pie_chart(
-                            df,
-                            categorical_cols[0],  # Use first categorical column as labels
-                            numeric_cols[0],      # Use first numeric column as values
-                            f"Pie Chart: {numeric_cols[0]} by {categorical_cols[0]}"
-                        )
-                        
-                        # Add zoom and download features
-                        fig.update_layout(
-                            height=500,
-                            width=1800,  # Increased width even more
-                            margin=dict(l=10, r=10, t=40, b=10),  # Reduced side margins even more
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label="Download Pie Chart",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name="pie_chart.html",
-                            mime="text/html",
-                            key="download_pie"
-                        )
-                    else:
-                        st.error("Need both numeric and categorical columns for a pie chart")
-                except Exception as e:
-                    st.error(f"Error creating pie chart: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
-    
-    with chart_buttons[2]:
-        if st.button("📉 Line Chart", key="line_chart"):
-            if df is not None:
-                try:
-                    # Get numeric columns for y-axis
-                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                    # Get categorical columns for x-axis
-                    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-                    
-                    if numeric_cols and categorical_cols:
-                        # Create a line chart
-                        chart_generator = ChartGenerator()
-                        fig = chart_generator.create_line_chart(
-                            df,
-                            categorical_cols[0],  # Use first categorical column as x
-                            numeric_cols[0],      # Use first numeric column as y
-                            None,                 # No color grouping
-                            f"Line Chart: {numeric_cols[0]} by {categorical_cols[0]}"
-                        )
-                        
-                        # Add zoom and download features
-                        fig.update_layout(
-                            height=500,
-                            width=1800,  # Increased width even more
-                            margin=dict(l=10, r=10, t=40, b=10),  # Reduced side margins even more
-                            hovermode='closest',
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label="Download Line Chart",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name="line_chart.html",
-                            mime="text/html",
-                            key="download_line"
-                        )
-                    else:
-                        st.error("Need both numeric and categorical columns for a line chart")
-                except Exception as e:
-                    st.error(f"Error creating line chart: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
-    
-    with chart_buttons[3]:
-        if st.button("🔍 Scatter Plot", key="scatter_plot"):
-            if df is not None:
-                try:
-                    # Get numeric columns for x and y axes
-                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                    
-                    if len(numeric_cols) >= 2:
-                        # Create a scatter plot
-                        chart_generator = ChartGenerator()
-                        fig = chart_generator.create_scatter_plot(
-                            df,
-                            numeric_cols[0],      # Use first numeric column as x
-                            numeric_cols[1],      # Use second numeric column as y
-                            None,                 # No color grouping
-                            None,                 # No size field
-                            f"Scatter Plot: {numeric_cols[1]} vs {numeric_cols[0]}"
-                        )
-                        
-                        # Add zoom and download features
-                        fig.update_layout(
-                            height=500,
-                            width=1800,  # Increased width even more
-                            margin=dict(l=10, r=10, t=40, b=10),  # Reduced side margins even more
-                            hovermode='closest',
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label="Download Scatter Plot",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name="scatter_plot.html",
-                            mime="text/html",
-                            key="download_scatter"
-                        )
-                    else:
-                        st.error("Need at least two numeric columns for a scatter plot")
-                except Exception as e:
-                    st.error(f"Error creating scatter plot: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
-
-    # Second row of buttons
-    chart_buttons2 = st.columns(4)
-    
-    with chart_buttons2[0]:
-        if st.button("⏱️ Time Series", key="time_series"):
-            if df is not None:
-                try:
-                    # Check if there's a date column
-                    date_cols = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]
-                    # Get numeric columns for values
-                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                    
-                    if date_cols and numeric_cols:
-                        # Create a time series chart
-                        chart_generator = ChartGenerator()
-                        fig = chart_generator.create_time_series(
-                            df,
-                            date_cols[0],         # Use first date column as time field
-                            numeric_cols[0],      # Use first numeric column as value field
-                            None,                 # No group field
-                            f"Time Series: {numeric_cols[0]} over time"
-                        )
-                        
-                        # Add zoom and download features with wider layout
-                        fig.update_layout(
-                            height=500,
-                            width=1800,  # Increased width even more
-                            margin=dict(l=10, r=10, t=40, b=10),  # Reduced side margins even more
-                            hovermode='closest',
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        # Use full container width for the chart
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label="Download Time Series Chart",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name="time_series_chart.html",
-                            mime="text/html",
-                            key="download_time_series"
-                        )
-                    else:
-                        st.error("Need a date column and a numeric column for a time series chart")
-                except Exception as e:
-                    st.error(f"Error creating time series chart: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
-    
-    with chart_buttons2[1]:
-        if st.button("📊 Statistics", key="statistics"):
-            if df is not None:
-                try:
-                    # Get numeric columns for statistics
-                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                    
-                    if numeric_cols:
-                        # Create a statistics chart
-                        chart_generator = ChartGenerator()
-                        fig = chart_generator.create_statistics(
-                            df,
-                            numeric_cols[0],      # Use first numeric column for statistics
-                            None,                 # No group field
-                            f"Statistics for {numeric_cols[0]}"
-                        )
-                        
-                        # Add zoom and download features
-                        fig.update_layout(
-                            height=500,
-                            width=1800,  # Increased width even more
-                            margin=dict(l=10, r=10, t=40, b=10),  # Reduced side margins even more
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label="Download Statistics Chart",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name="statistics_chart.html",
-                            mime="text/html",
-                            key="download_statistics"
-                        )
-                    else:
-                        st.error("Need at least one numeric column for statistics")
-                except Exception as e:
-                    st.error(f"Error creating statistics chart: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
+    # Column roles come from the dataset profile, computed once per dataset
+    roles = profile['roles'] if profile is not None else None
     
-    with chart_buttons2[2]:
-        if st.button("🎯 Gauge", key="gauge"):
-            if df is not None:
-                try:
-                    # Get numeric columns for gauge
-                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                    
-                    if numeric_cols:
-                        # Create a gauge chart
-                        chart_generator = ChartGenerator()
-                        fig = chart_generator.create_gauge(
-                            df,
-                            numeric_cols[0],      # Use first numeric column for gauge
-                            f"Gauge: {numeric_cols[0]}",
-                            None,                 # No min value
-                            None                  # No max value
-                        )
-                        
-                        # Add zoom and download features
-                        fig.update_layout(
-                            height=500,
-                            width=1800,  # Increased width even more
-                            margin=dict(l=10, r=10, t=40, b=10),  # Reduced side margins even more
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        st.download_button(
-                            label="Download Gauge Chart",
-                            data=fig.to_html(include_plotlyjs='cdn'),
-                            file_name="gauge_chart.html",
-                            mime="text/html",
-                            key="download_gauge"
-                        )
+    # Two rows of buttons for each chart type with wider spacing
+    for row in (QUICK_CHARTS[:4], QUICK_CHARTS[4:]):
+        chart_buttons = st.columns(4)
+        for button_col, (chart_type, label, key) in zip(chart_buttons, row):
+            with button_col:
+                if st.button(label, key=key):
+                    if df is None:
+                        st.error("Please upload a data file or use sample data first!")
                     else:
-                        st.error("Need at least one numeric column for a gauge chart")
-                except Exception as e:
-                    st.error(f"Error creating gauge chart: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
+                        chart_spec = ChartGenerator.quick_chart_spec(chart_type, roles)
+                        if chart_spec is None:
+                            st.error(CHART_REGISTRY[chart_type]['requirement'])
+                        else:
+                            # Kept across reruns so its download can be prepared on demand
+                            st.session_state['quick_chart'] = chart_spec
     
-    with chart_buttons2[3]:
-        if st.button("📋 Table", key="table"):
-            if df is not None:
-                try:
-                    # Create a table
-                    chart_generator = ChartGenerator()
-                    fig = chart_generator.create_table(
-                        df,
-                        None,                    # Use all columns
-                        "Data Table",
-                        10                       # Show first 10 rows
-                    )
-                    
-                    # Add zoom and download features
-                    fig.update_layout(
-                        height=500,
-                        width=1800,  # Increased width even more
-                        margin=dict(l=10, r=10, t=40, b=10)  # Reduced side margins even more
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                    st.download_button(
-                        label="Download Table",
-                        data=fig.to_html(include_plotlyjs='cdn'),
-                        file_name="data_table.html",
-                        mime="text/html",
-                        key="download_table"
-                    )
-                except Exception as e:
-                    st.error(f"Error creating table: {str(e)}")
-            else:
-                st.error("Please upload a data file or use sample data first!")
+    quick_chart = st.session_state.get('quick_chart')
+    if df is not None and quick_chart and all(
+        quick_chart.get(field) in df.columns for field in CHART_REGISTRY[quick_chart['type']]['required']
+    ):
+        result = resolve_charts(state, df, [quick_chart], 'quick:')[0]
+        render_result(result, 0, [st.container()])
+        render_download_controls([result], None, key_prefix="quick_")
     
     # Add a footer
     st.markdown("<div class='footer'>© 2023 AI Dashboard Generator | Created with ❤️</div>", unsafe_allow_html=True)
@@ -1,64 +1,198 @@
+import os
+import sys
+import json
+import time
+import argparse
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List, Any
-import json
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Union
+from modules.data_loader import DataLoader
+from modules.spec_parser import ChartSpecParser
+from modules.chart_generator import ChartGenerator
+from modules.dashboard_builder import DashboardBuilder
+from modules.downloads import dashboard_page
+
+OUTPUT_FORMATS = ('html', 'json')
+
+
+@lru_cache(maxsize=8)
+def _load_cached(data_path: str) -> pd.DataFrame:
+    """Load a dataset once per worker process; batch jobs often share their data"""
+    return DataLoader.load_data(data_path)
+
+
+def _render_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one batch job, reporting errors instead of raising"""
+    start = time.perf_counter()
+    result = {'output': job.get('output'), 'error': None}
+    try:
+        generator = DashboardGenerator()
+        generator.data = _load_cached(job['data'])
+        generator.render(job['spec'], job['output'], job.get('format'))
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _render_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Render a run of jobs sharing one dataset in a worker process, loading it once"""
+    return [_render_job(job) for job in jobs]
+
 
 class DashboardGenerator:
+    """Headless dashboard engine: data file plus spec in, standalone HTML or JSON out"""
+
     def __init__(self):
         self.data = None
         self.spec = None
+        self.spec_parser = ChartSpecParser()
+        # Each dashboard is rendered once, so the shared figure cache would only cost memory
+        self.builder = DashboardBuilder(ChartGenerator(), use_cache=False)
 
     def load_data(self, file_path: str) -> pd.DataFrame:
-        """Load data from various file formats"""
-        if file_path.endswith('.csv'):
-            self.data = pd.read_csv(file_path)
-        elif file_path.endswith('.xlsx'):
-            self.data = pd.read_excel(file_path)
-        # TODO: Add PDF support
+        """Load data from CSV, Excel or PDF files"""
+        self.data = DataLoader.load_data(file_path)
         return self.data
 
-    def parse_specification(self, spec_text: str) -> Dict[str, Any]:
-        """Parse natural language specification into structured format"""
-        # TODO: Implement LLM-based parsing
-        self.spec = {
-            "dashboard_title": "Sample Dashboard",
-            "charts": []
-        }
+    def parse_specification(self, spec: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Turn a spec given as text, a JSON string, a .json path or a dict into a validated spec"""
+        if isinstance(spec, str) and spec.endswith('.json') and os.path.exists(spec):
+            with open(spec, 'r', encoding='utf-8') as f:
+                spec = json.load(f)
+        elif isinstance(spec, str) and spec.lstrip().startswith('{'):
+            spec = json.loads(spec)
+
+        if isinstance(spec, str):
+            self.spec = self.spec_parser.parse_specification(spec, self.data)
+            return self.spec
+
+        spec = dict(spec)
+        spec.setdefault('dashboard_title', "Dashboard")
+        spec.setdefault('layout', {'rows': max(1, (len(spec.get('charts', [])) + 1) // 2), 'columns': 2})
+        self.spec_parser.validate_spec(spec)
+        self.spec = spec
         return self.spec
 
     def generate_chart(self, chart_spec: Dict[str, Any]) -> go.Figure:
         """Generate a single chart based on specification"""
-        chart_type = chart_spec.get('type', 'bar')
-        
-        if chart_type == 'bar':
-            fig = px.bar(
-                self.data,
-                x=chart_spec.get('x_field'),
-                y=chart_spec.get('y_field'),
-                color=chart_spec.get('color_field'),
-                title=chart_spec.get('title')
-            )
-        elif chart_type == 'pie':
-            fig = px.pie(
-                self.data,
-                names=chart_spec.get('labels_field'),
-                values=chart_spec.get('values_field'),
-                title=chart_spec.get('title')
-            )
-        else:
-            raise ValueError(f"Unsupported chart type: {chart_type}")
-        
-        return fig
+        return self.builder.build_figure(self.data, chart_spec)
 
-    def generate_dashboard(self, data_path: str, spec_text: str) -> List[go.Figure]:
+    def generate_dashboard(self, data_path: str, spec: Union[str, Dict[str, Any]]) -> List[go.Figure]:
         """Generate complete dashboard from data and specification"""
         self.load_data(data_path)
-        spec = self.parse_specification(spec_text)
-        
-        charts = []
-        for chart_spec in spec.get('charts', []):
-            chart = self.generate_chart(chart_spec)
-            charts.append(chart)
-        
-        return charts 
\ No newline at end of file
+        spec = self.parse_specification(spec)
+
+        results = self.builder.build_all(self.data, spec.get('charts', []))
+        for result in results:
+            if result['error']:
+                raise ValueError(f"Could not build {result['spec'].get('title')}: {result['error']}")
+        return [result['figure'] for result in results]
+
+    def render(self, spec: Union[str, Dict[str, Any]], output_path: str, output_format: str = None) -> str:
+        """Render the loaded data with a spec and write it as HTML or JSON, returning the path"""
+        output_format = output_format or ('json' if output_path.endswith('.json') else 'html')
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        spec = self.parse_specification(spec)
+        results = self.builder.build_all(self.data, spec['charts'])
+        for result in results:
+            if result['error']:
+                raise ValueError(f"Could not build {result['spec'].get('title')}: {result['error']}")
+        figures = [result['figure'] for result in results]
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if output_format == 'html':
+                divs = [DashboardBuilder.figure_html(fig, full_html=False) for fig in figures]
+                f.write(dashboard_page(spec['dashboard_title'], divs))
+            else:
+                json.dump({
+                    'spec': spec,
+                    'figures': [json.loads(fig.to_json()) for fig in figures]
+                }, f)
+        return output_path
+
+    @staticmethod
+    def render_batch(jobs: List[Dict[str, Any]], max_workers: int = None) -> List[Dict[str, Any]]:
+        """Render many dashboards in worker processes, returning one result per job in order.
+
+        Each job is a dict with 'data', 'spec', 'output' and optional 'format'.
+        Jobs for the same data path are sent to a worker together, in runs of
+        at most len(jobs) / max_workers so one popular dataset still spreads
+        over every worker; each run loads its dataset once.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        run_size = max(1, -(-len(jobs) // max_workers))
+        groups: Dict[str, List[int]] = {}
+        for i, job in enumerate(jobs):
+            groups.setdefault(str(job['data']), []).append(i)
+        runs = [
+            indices[start:start + run_size]
+            for indices in groups.values()
+            for start in range(0, len(indices), run_size)
+        ]
+        results = [None] * len(jobs)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for run, rendered in zip(runs, pool.map(_render_jobs, [[jobs[i] for i in run] for run in runs])):
+                for i, result in zip(run, rendered):
+                    results[i] = result
+        return results
+
+
+def read_jobs(path: str) -> List[Dict[str, Any]]:
+    """Read batch jobs from a JSON list or a JSON Lines file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render dashboards without Streamlit")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    render_parser = subparsers.add_parser('render', help="Render one dashboard")
+    render_parser.add_argument('data', help="CSV, Excel or PDF data file")
+    render_parser.add_argument('spec', help="Dashboard description, JSON spec, or path to a .json spec")
+    render_parser.add_argument('-o', '--output', required=True, help="Output .html or .json path")
+    render_parser.add_argument('--format', choices=OUTPUT_FORMATS, help="Output format (default from extension)")
+
+    batch_parser = subparsers.add_parser('batch', help="Render many dashboards in parallel")
+    batch_parser.add_argument('jobs', help="JSON or JSON Lines file of {data, spec, output, format} jobs")
+    batch_parser.add_argument('-w', '--workers', type=int, help="Worker processes (default: CPU count)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'render':
+        try:
+            generator = DashboardGenerator()
+            generator.load_data(args.data)
+            print(generator.render(args.spec, args.output, args.format))
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    jobs = read_jobs(args.jobs)
+    start = time.perf_counter()
+    results = DashboardGenerator.render_batch(jobs, args.workers)
+    failures = 0
+    for result in results:
+        if result['error']:
+            failures += 1
+            print(f"FAILED {result['output']}: {result['error']}", file=sys.stderr)
+        else:
+            print(f"{result['output']} ({result['seconds']:.2f}s)")
+    print(f"Rendered {len(results) - failures}/{len(results)} dashboards in {time.perf_counter() - start:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import pandas as pd
+from typing import List, Optional
+
+SUPPORTED_AGGREGATIONS = ('sum', 'mean', 'median', 'min', 'max', 'count')
+
+
+class Aggregator:
+    @staticmethod
+    def sample_scale(data: pd.DataFrame) -> float:
+        """Factor from a streamed sample's sums and counts up to the whole file, 1.0 if not sampled.
+
+        DataLoader.load_csv_chunked records the sampling in ``attrs``, which
+        pandas carries over to filtered frames, so filtered totals scale too.
+        """
+        summary = data.attrs.get('stream_summary') or {}
+        if not summary.get('sampled') or not summary.get('kept_rows'):
+            return 1.0
+        return summary['rows'] / summary['kept_rows']
+
+    @staticmethod
+    def aggregate(
+        data: pd.DataFrame,
+        group_fields: List[Optional[str]],
+        value_field: str,
+        agg: str = 'sum'
+    ) -> pd.DataFrame:
+        """Collapse rows to one per group so figure size scales with cardinality, not row count.
+
+        Sums and counts over a sampled streamed load are scaled up to estimate
+        the whole file.
+        """
+        if agg not in SUPPORTED_AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {agg}")
+
+        group_fields = list(dict.fromkeys(f for f in group_fields if f))
+        if not group_fields or value_field in group_fields:
+            return data
+        if agg != 'count' and not pd.api.types.is_numeric_dtype(data[value_field]):
+            # Nothing meaningful to sum; plot the rows as before
+            return data
+
+        grouped = data.groupby(group_fields, observed=True, sort=False, dropna=False)[value_field]
+        result = grouped.agg(agg)
+        scale = Aggregator.sample_scale(data)
+        if scale != 1.0 and agg in ('sum', 'count'):
+            result = result * scale
+        return result.reset_index()
@@ -0,0 +1,323 @@
+import json
+import threading
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+# Keys that commonly hold the record list in paginated API envelopes
+RECORD_KEYS = ('data', 'results', 'items', 'records', 'rows')
+
+
+class ColumnBuffer:
+    """Accumulates JSON records column by column and builds one DataFrame at the end"""
+
+    def __init__(self):
+        self.columns: Dict[str, list] = {}
+        self.n_rows = 0
+
+    def extend(self, records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            if not isinstance(record, dict):
+                raise ValueError(
+                    f"Expected JSON objects as records, got {type(record).__name__}: {record!r:.80}"
+                )
+            for key, value in record.items():
+                column = self.columns.get(key)
+                if column is None:
+                    # A key first seen mid-stream is missing for all earlier rows
+                    column = self.columns[key] = [None] * self.n_rows
+                column.append(value)
+            self.n_rows += 1
+            if len(record) < len(self.columns):
+                for column in self.columns.values():
+                    if len(column) < self.n_rows:
+                        column.append(None)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+
+class SizedLRU:
+    """Least-recently-used entries kept under a total size in bytes; not thread-safe on its own"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+
+class APIDataSource:
+    """Pooled HTTP data source with retries, pagination and conditional requests.
+
+    Every page is revalidated with ETag / Last-Modified, so refreshing an
+    unchanged feed costs one 304 round-trip per page instead of a full download.
+    Cached pages and frames are kept least-recently-used first under byte budgets.
+    """
+
+    # (connect, read) timeouts in seconds
+    DEFAULT_TIMEOUT = (5, 30)
+    DEFAULT_PAGE_SIZE = 1000
+    # Hard stop for runaway pagination
+    MAX_PAGES = 10_000
+    # Budgets for the revalidation caches: downloaded page bodies, and built frames
+    DEFAULT_MAX_PAGE_BYTES = 64 * 1024 * 1024
+    DEFAULT_MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Tuple[float, float] = None,
+        max_workers: int = 4,
+        max_page_bytes: int = None,
+        max_frame_bytes: int = None
+    ):
+        self.timeout = timeout or APIDataSource.DEFAULT_TIMEOUT
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET'])
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Page request -> {'etag', 'last_modified', 'headers', 'payload'}, sized by the response body
+        self._validators = SizedLRU(max_page_bytes or APIDataSource.DEFAULT_MAX_PAGE_BYTES)
+        # Fetch -> {'pages', 'frame'}, reused when every page revalidates
+        self._frames = SizedLRU(max_frame_bytes or APIDataSource.DEFAULT_MAX_FRAME_BYTES)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def extract_records(payload: Any, records_path: str = None) -> List[Dict[str, Any]]:
+        """Find the list of records in a JSON payload"""
+        if records_path:
+            for key in records_path.split('.'):
+                payload = payload.get(key, []) if isinstance(payload, dict) else []
+            return payload
+        if isinstance(payload, list):
+            return payload
+        if isinstance(payload, dict):
+            for key in RECORD_KEYS:
+                if isinstance(payload.get(key), list):
+                    return payload[key]
+            if payload and all(isinstance(v, list) for v in payload.values()):
+                # Column-oriented payload, as pd.read_json accepted before
+                return pd.DataFrame(payload).to_dict('records')
+            return [payload]
+        return []
+
+    @staticmethod
+    def _lookup(payload: Any, path: str) -> Any:
+        for key in path.split('.'):
+            if not isinstance(payload, dict):
+                return None
+            payload = payload.get(key)
+        return payload
+
+    def _get(self, url: str, params: Dict[str, Any], headers: Dict[str, str] = None) -> requests.Response:
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def _get_page(self, url: str, params: Dict[str, Any]) -> Tuple[Any, Dict[str, str], Optional[bool]]:
+        """GET one page, revalidating it against its cached copy.
+
+        Returns the JSON payload, the response headers and True if the server
+        confirmed the cached copy is current (HTTP 304), False if the page was
+        downloaded, or None if it was downloaded and cannot be revalidated.
+        """
+        page_key = json.dumps([url, sorted(params.items())], default=str)
+        with self._lock:
+            cached = self._validators.get(page_key)
+
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self._get(url, params, headers)
+        if response.status_code == 304 and cached:
+            return cached['payload'], cached['headers'], True
+        if response.status_code == 304:
+            raise ValueError(f"Unexpected 304 Not Modified for an uncached request to {url}")
+
+        payload = response.json()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return payload, dict(response.headers), None
+        with self._lock:
+            self._validators.put(page_key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': dict(response.headers),
+                'payload': payload
+            }, len(response.content))
+        return payload, dict(response.headers), False
+
+    def fetch(
+        self,
+        url: str,
+        params: Dict[str, Any] = None,
+        pagination: str = None,
+        records_path: str = None,
+        page_size: int = None,
+        offset_param: str = 'offset',
+        limit_param: str = 'limit',
+        total_path: str = 'total',
+        cursor_param: str = 'cursor',
+        cursor_path: str = 'next_cursor'
+    ) -> pd.DataFrame:
+        """Fetch all records from an endpoint as a DataFrame.
+
+        ``pagination`` is None for a single request, ``'offset'`` for
+        offset/limit paging (remaining pages are fetched concurrently once the
+        total is known) or ``'cursor'`` for cursor paging, which is inherently
+        sequential. Every page is revalidated with its own ETag /
+        Last-Modified; when all pages come back 304 the previous frame is
+        reused without rebuilding it.
+        """
+        params = dict(params or {})
+        page_size = page_size or APIDataSource.DEFAULT_PAGE_SIZE
+        if pagination == 'offset':
+            params.update({offset_param: 0, limit_param: page_size})
+
+        first_payload, first_headers, first_unchanged = self._get_page(url, params)
+        pages = [APIDataSource.extract_records(first_payload, records_path)]
+        unchanged = [first_unchanged]
+
+        if pagination == 'offset':
+            self._fetch_offset_pages(
+                pages, unchanged, url, params, first_payload, first_headers, records_path,
+                page_size, offset_param, total_path
+            )
+        elif pagination == 'cursor':
+            self._fetch_cursor_pages(
+                pages, unchanged, url, params, first_payload, records_path, cursor_param, cursor_path
+            )
+
+        cache_key = json.dumps([url, sorted(params.items()), pagination, records_path], default=str)
+        page_count = len(pages)
+        with self._lock:
+            cached = self._frames.get(cache_key)
+        if all(unchanged) and cached and cached['pages'] == page_count:
+            return cached['frame'].copy()
+
+        buffer = ColumnBuffer()
+        for records in pages:
+            buffer.extend(records)
+        frame = buffer.to_frame()
+        if all(flag is not None for flag in unchanged):
+            # Every page can be revalidated, so the frame can be reused next time
+            with self._lock:
+                self._frames.put(cache_key, {'pages': page_count, 'frame': frame},
+                                 int(frame.memory_usage(index=True, deep=True).sum()))
+            frame = frame.copy()
+        return frame
+
+    def _fetch_offset_pages(
+        self,
+        pages: List[List[Dict[str, Any]]],
+        unchanged: List[bool],
+        url: str,
+        params: Dict[str, Any],
+        first_payload: Any,
+        first_headers: Dict[str, str],
+        records_path: str,
+        page_size: int,
+        offset_param: str,
+        total_path: str
+    ) -> None:
+        """Fetch offset pages after the first, in parallel, appending them in order"""
+        if len(pages[0]) < page_size:
+            return
+
+        total = APIDataSource._lookup(first_payload, total_path)
+        if total is None:
+            total = first_headers.get('X-Total-Count')
+
+        def fetch_page(offset: int) -> Tuple[List[Dict[str, Any]], bool]:
+            payload, _, page_unchanged = self._get_page(url, dict(params, **{offset_param: offset}))
+            return APIDataSource.extract_records(payload, records_path), page_unchanged
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            if total is not None:
+                offsets = range(page_size, int(total), page_size)
+                for records, page_unchanged in pool.map(fetch_page, offsets):
+                    pages.append(records)
+                    unchanged.append(page_unchanged)
+                return
+
+            # Unknown total: fetch a wave of pages at a time until a short page
+            next_offset = page_size
+            for _ in range(APIDataSource.MAX_PAGES // self.max_workers):
+                offsets = [next_offset + i * page_size for i in range(self.max_workers)]
+                next_offset = offsets[-1] + page_size
+                for records, page_unchanged in pool.map(fetch_page, offsets):
+                    pages.append(records)
+                    unchanged.append(page_unchanged)
+                    if len(records) < page_size:
+                        return
+
+    def _fetch_cursor_pages(
+        self,
+        pages: List[List[Dict[str, Any]]],
+        unchanged: List[bool],
+        url: str,
+        params: Dict[str, Any],
+        payload: Any,
+        records_path: str,
+        cursor_param: str,
+        cursor_path: str
+    ) -> None:
+        """Follow next-page cursors until the server stops returning one"""
+        for _ in range(APIDataSource.MAX_PAGES):
+            cursor = APIDataSource._lookup(payload, cursor_path)
+            if not cursor:
+                return
+            payload, _, page_unchanged = self._get_page(url, dict(params, **{cursor_param: cursor}))
+            pages.append(APIDataSource.extract_records(payload, records_path))
+            unchanged.append(page_unchanged)
+
+
+_api_source = None
+_api_source_lock = threading.Lock()
+
+
+def get_api_source() -> APIDataSource:
+    """Return the process-wide API source so connections are pooled across sessions"""
+    global _api_source
+    if _api_source is None:
+        with _api_source_lock:
+            if _api_source is None:
+                _api_source = APIDataSource()
+    return _api_source
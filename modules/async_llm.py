@@ -0,0 +1,131 @@
+import json
+import re
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, List, Optional, Tuple
+from .prompt_builder import PromptBuilder
+from .chart_types import CHART_TYPES
+
+# Runs blocking generate_content calls. It lives outside any event loop, so
+# asyncio.run() does not wait for timed-out calls before returning.
+_blocking_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='llm')
+
+
+def default_chart_title(chart_type: str, fields: list) -> str:
+    return f"{chart_type.capitalize()} Chart of {', '.join(fields)}"
+
+
+def run_sync(coro: Awaitable) -> Any:
+    """Run a coroutine to completion from synchronous code such as a Streamlit script.
+
+    Uses a private thread when the caller already has a running event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+class AsyncLLMClient:
+    """Concurrent front end for a generative model.
+
+    Calls fan out under a concurrency limit and each one has a timeout. When
+    the caller cancels, in-flight calls are cancelled too. The model only needs
+    ``generate_content``; ``generate_content_async`` is used when it exists,
+    so a simple fake model works in tests.
+    """
+
+    DEFAULT_CONCURRENCY = 4
+    DEFAULT_TIMEOUT = 30.0
+    # Chart titles requested per prompt when batching
+    TITLE_BATCH_SIZE = 10
+
+    def __init__(self, model: Any, max_concurrency: int = None, timeout: float = None):
+        self.model = model
+        self.max_concurrency = max_concurrency or AsyncLLMClient.DEFAULT_CONCURRENCY
+        self.timeout = timeout or AsyncLLMClient.DEFAULT_TIMEOUT
+
+    async def _call(self, prompt: str) -> str:
+        if hasattr(self.model, 'generate_content_async'):
+            response = await self.model.generate_content_async(prompt)
+        else:
+            # A timed-out blocking call cannot be interrupted; its result is discarded
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(_blocking_executor, self.model.generate_content, prompt)
+        return response.text
+
+    async def generate(self, prompt: str, semaphore: Optional[asyncio.Semaphore] = None) -> str:
+        """Run one prompt with the per-call timeout, inside the concurrency limit"""
+        if semaphore is None:
+            return await asyncio.wait_for(self._call(prompt), self.timeout)
+        async with semaphore:
+            return await asyncio.wait_for(self._call(prompt), self.timeout)
+
+    async def generate_many(self, prompts: List[str]) -> List[Any]:
+        """Run prompts concurrently, returning text or the exception for each prompt"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self.generate(prompt, semaphore)) for prompt in prompts]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def suggest_chart_types(self, requests: List[Tuple[str, str]]) -> List[str]:
+        """Suggest a chart type for each (data description, goal) pair"""
+        prompts = [PromptBuilder.build_chart_type_prompt(desc, goal) for desc, goal in requests]
+        results = await self.generate_many(prompts)
+        suggestions = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error in chart type suggestion: {result!r}")
+                suggestions.append("bar")
+                continue
+            suggestion = result.strip().lower()
+            suggestions.append(suggestion if suggestion in CHART_TYPES else "bar")
+        return suggestions
+
+    async def generate_chart_titles(
+        self,
+        charts: List[Tuple[str, list]],
+        batch_size: int = None
+    ) -> List[str]:
+        """Title (chart type, fields) pairs, several per prompt, with batches in parallel"""
+        batch_size = batch_size or AsyncLLMClient.TITLE_BATCH_SIZE
+        batches = [charts[i:i + batch_size] for i in range(0, len(charts), batch_size)]
+        results = await self.generate_many([PromptBuilder.build_batch_title_prompt(b) for b in batches])
+
+        titles = []
+        for batch, result in zip(batches, results):
+            parsed = None
+            if isinstance(result, Exception):
+                print(f"Error in title generation: {result!r}")
+            else:
+                match = re.search(r'\[[\s\S]*\]', result)
+                try:
+                    parsed = json.loads(match.group(0)) if match else None
+                except json.JSONDecodeError:
+                    parsed = None
+            if not isinstance(parsed, list) or len(parsed) != len(batch):
+                parsed = [None] * len(batch)
+            for (chart_type, fields), title in zip(batch, parsed):
+                titles.append(title.strip() if isinstance(title, str) and title.strip()
+                              else default_chart_title(chart_type, fields))
+        return titles
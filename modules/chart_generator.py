@@ -2,18 +2,31 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from .aggregation import Aggregator
+from .downsampling import Downsampler
+from .statistics import StatisticsKernel
+from .chart_types import CHART_TYPES
 
 class ChartGenerator:
+    # Scatter plots switch to WebGL above this many points...
+    WEBGL_THRESHOLD = 50_000
+    # ...and to a server-side density heatmap above this many
+    DENSITY_THRESHOLD = 1_000_000
+    DENSITY_BINS = 200
+
     @staticmethod
     def create_bar_chart(
         data: pd.DataFrame,
         x_field: str,
         y_field: str,
         color_field: str = None,
-        title: str = None
+        title: str = None,
+        aggregate: Optional[str] = 'sum'
     ) -> go.Figure:
-        """Create a bar chart"""
+        """Create a bar chart, aggregating y per x/color group unless aggregate is None"""
+        if aggregate:
+            data = Aggregator.aggregate(data, [x_field, color_field], y_field, aggregate)
         fig = px.bar(
             data,
             x=x_field,
@@ -32,9 +45,12 @@ class ChartGenerator:
         data: pd.DataFrame,
         labels_field: str,
         values_field: str,
-        title: str = None
+        title: str = None,
+        aggregate: Optional[str] = 'sum'
     ) -> go.Figure:
-        """Create a pie chart"""
+        """Create a pie chart, aggregating values per label unless aggregate is None"""
+        if aggregate:
+            data = Aggregator.aggregate(data, [labels_field], values_field, aggregate)
         fig = px.pie(
             data,
             names=labels_field,
@@ -53,9 +69,11 @@ class ChartGenerator:
         x_field: str,
         y_field: str,
         color_field: str = None,
-        title: str = None
+        title: str = None,
+        max_points: int = None
     ) -> go.Figure:
-        """Create a line chart"""
+        """Create a line chart, downsampling each line to max_points (default from chart width)"""
+        data = Downsampler.downsample(data, x_field, y_field, color_field, max_points)
         fig = px.line(
             data,
             x=x_field,
@@ -76,22 +94,66 @@ class ChartGenerator:
         y_field: str,
         color_field: str = None,
         size_field: str = None,
-        title: str = None
+        title: str = None,
+        webgl_threshold: int = None,
+        density_threshold: int = None
     ) -> go.Figure:
-        """Create a scatter plot"""
+        """Create a scatter plot, using WebGL or a density heatmap for large data"""
+        webgl_threshold = webgl_threshold or ChartGenerator.WEBGL_THRESHOLD
+        density_threshold = density_threshold or ChartGenerator.DENSITY_THRESHOLD
+        numeric_axes = all(
+            pd.api.types.is_numeric_dtype(data[f]) and not pd.api.types.is_bool_dtype(data[f])
+            for f in (x_field, y_field)
+        )
+        if len(data) > density_threshold and numeric_axes:
+            return ChartGenerator.create_density_heatmap(data, x_field, y_field, title)
+
         fig = px.scatter(
             data,
             x=x_field,
             y=y_field,
             color=color_field,
             size=size_field,
-            title=title
+            title=title,
+            render_mode='webgl' if len(data) > webgl_threshold else 'auto'
         )
         fig.update_layout(
             template="plotly_white",
             margin=dict(t=50, l=50, r=50, b=50)
         )
         return fig
+
+    @staticmethod
+    def create_density_heatmap(
+        data: pd.DataFrame,
+        x_field: str,
+        y_field: str,
+        title: str = None,
+        bins: int = None
+    ) -> go.Figure:
+        """Create a heatmap of point counts, binned with NumPy so only the grid is sent to the browser"""
+        bins = bins or ChartGenerator.DENSITY_BINS
+        x = data[x_field].to_numpy(dtype=np.float64, na_value=np.nan)
+        y = data[y_field].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = np.isfinite(x) & np.isfinite(y)
+        counts, x_edges, y_edges = np.histogram2d(x[valid], y[valid], bins=bins)
+
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            # histogram2d indexes counts as [x, y]; Heatmap expects rows of y
+            z=np.where(counts.T > 0, counts.T, np.nan),
+            colorscale='Viridis',
+            colorbar=dict(title='Count')
+        ))
+        fig.update_layout(
+            title=title,
+            xaxis_title=x_field,
+            yaxis_title=y_field,
+            template="plotly_white",
+            margin=dict(t=50, l=50, r=50, b=50)
+        )
+        return fig
         
     @staticmethod
     def create_time_series(
@@ -99,17 +161,19 @@ class ChartGenerator:
         time_field: str,
         value_field: str,
         group_field: str = None,
-        title: str = None
+        title: str = None,
+        max_points: int = None
     ) -> go.Figure:
-        """Create a time series chart"""
-        # Ensure time field is datetime
+        """Create a time series chart, downsampling each group to max_points (default from chart width)"""
+        # Ensure time field is datetime, without modifying the caller's frame
         if not pd.api.types.is_datetime64_any_dtype(data[time_field]):
             try:
-                data[time_field] = pd.to_datetime(data[time_field])
+                data = data.assign(**{time_field: pd.to_datetime(data[time_field])})
             except:
                 # If conversion fails, use as is
                 pass
-                
+
+        data = Downsampler.downsample(data, time_field, value_field, group_field, max_points)
         fig = px.line(
             data,
             x=time_field,
@@ -134,42 +198,21 @@ class ChartGenerator:
         group_field: str = None,
         title: str = None
     ) -> go.Figure:
-        """Create a statistics chart showing mean, median, min, max"""
+        """Create a statistics chart showing mean, median, min, max and standard deviation"""
+        summary = StatisticsKernel.summarize(data, value_field, group_field)
+        bars = [
+            ('Mean', 'mean', 'rgba(55, 83, 109, 0.7)'),
+            ('Median', 'median', 'rgba(26, 118, 255, 0.7)'),
+            ('Min', 'min', 'rgba(0, 255, 0, 0.7)'),
+            ('Max', 'max', 'rgba(255, 0, 0, 0.7)'),
+            ('Std Dev', 'std', 'rgba(255, 165, 0, 0.7)')
+        ]
         if group_field:
-            # Group by the specified field
-            grouped_data = data.groupby(group_field)[value_field].agg(['mean', 'median', 'min', 'max']).reset_index()
-            
-            # Create a figure with subplots
-            fig = go.Figure()
-            
-            # Add traces for each statistic
-            fig.add_trace(go.Bar(
-                name='Mean',
-                x=grouped_data[group_field],
-                y=grouped_data['mean'],
-                marker_color='rgba(55, 83, 109, 0.7)'
-            ))
-            
-            fig.add_trace(go.Bar(
-                name='Median',
-                x=grouped_data[group_field],
-                y=grouped_data['median'],
-                marker_color='rgba(26, 118, 255, 0.7)'
-            ))
-            
-            fig.add_trace(go.Bar(
-                name='Min',
-                x=grouped_data[group_field],
-                y=grouped_data['min'],
-                marker_color='rgba(0, 255, 0, 0.7)'
-            ))
-            
-            fig.add_trace(go.Bar(
-                name='Max',
-                x=grouped_data[group_field],
-                y=grouped_data['max'],
-                marker_color='rgba(255, 0, 0, 0.7)'
-            ))
+            # One trace per statistic, grouped by the specified field
+            fig = go.Figure([
+                go.Bar(name=name, x=summary[group_field], y=summary[column], marker_color=color)
+                for name, column, color in bars
+            ])
             
             fig.update_layout(
                 barmode='group',
@@ -180,19 +223,12 @@ class ChartGenerator:
                 margin=dict(t=50, l=50, r=50, b=50)
             )
         else:
-            # Calculate statistics for the entire dataset
-            stats = {
-                'Mean': data[value_field].mean(),
-                'Median': data[value_field].median(),
-                'Min': data[value_field].min(),
-                'Max': data[value_field].max(),
-                'Std Dev': data[value_field].std()
-            }
-            
+            # Statistics for the entire dataset
+            stats = summary.iloc[0]
             fig = go.Figure(data=[
                 go.Bar(
-                    x=list(stats.keys()),
-                    y=list(stats.values()),
+                    x=[name for name, _, _ in bars],
+                    y=[stats[column] for _, column, _ in bars],
                     marker_color='rgba(55, 83, 109, 0.7)'
                 )
             ])
@@ -216,14 +252,15 @@ class ChartGenerator:
         max_value: float = None
     ) -> go.Figure:
         """Create a gauge chart"""
-        # Calculate the value (use mean if multiple rows)
-        value = data[value_field].mean()
+        # Calculate the value (use mean if multiple rows), with min and max from the same pass
+        stats = StatisticsKernel.compute(data[value_field], quantiles=())
+        value = stats['mean']
         
         # Determine min and max if not provided
         if min_value is None:
-            min_value = data[value_field].min() * 0.9  # 10% below min
+            min_value = stats['min'] * 0.9  # 10% below min
         if max_value is None:
-            max_value = data[value_field].max() * 1.1  # 10% above max
+            max_value = stats['max'] * 1.1  # 10% above max
             
         fig = go.Figure(go.Indicator(
             mode="gauge+number",
@@ -288,4 +325,106 @@ class ChartGenerator:
             margin=dict(t=50, l=50, r=50, b=50)
         )
         
-        return fig 
\ No newline at end of file
+        return fig
+
+    @staticmethod
+    def create_chart(data: pd.DataFrame, chart_spec: Dict[str, Any]) -> go.Figure:
+        """Build any registered chart type from its spec.
+
+        Spec keys match the builder's parameter names, so required and optional
+        fields are passed straight through as keyword arguments.
+        """
+        chart_type = CHART_REGISTRY.get(chart_spec['type'])
+        if chart_type is None:
+            raise ValueError(f"Unsupported chart type: {chart_spec['type']}")
+        kwargs = {field: chart_spec[field] for field in chart_type['required']}
+        kwargs.update({field: chart_spec.get(field, default) for field, default in chart_type['optional'].items()})
+        return chart_type['builder'](data, title=chart_spec.get('title'), **kwargs)
+
+    @staticmethod
+    def quick_chart_spec(chart_type: str, roles: Dict[str, List[str]]) -> Optional[Dict[str, Any]]:
+        """Spec for a one-click chart from the first suitable columns, or None if the data lacks them.
+
+        roles maps 'numeric', 'categorical' and 'date' to column names, as in a dataset profile.
+        """
+        registered = CHART_REGISTRY[chart_type]
+        spec = {'type': chart_type}
+        for field, (role, position) in registered['quick_roles'].items():
+            if len(roles[role]) <= position:
+                return None
+            spec[field] = roles[role][position]
+        spec['title'] = registered['quick_title'].format(**spec)
+        return spec
+
+
+# Chart types with their builders and the spec fields each reads. quick_roles
+# maps fields to (column role, index) for the one-click charts.
+CHART_REGISTRY = {
+    'bar': {
+        'builder': ChartGenerator.create_bar_chart,
+        'required': ('x_field', 'y_field'),
+        'optional': {'color_field': None, 'aggregate': 'sum'},
+        'quick_roles': {'x_field': ('categorical', 0), 'y_field': ('numeric', 0)},
+        'quick_title': "Bar Chart: {y_field} by {x_field}",
+        'requirement': "Need both numeric and categorical columns for a bar chart"
+    },
+    'pie': {
+        'builder': ChartGenerator.create_pie_chart,
+        'required': ('labels_field', 'values_field'),
+        'optional': {'aggregate': 'sum'},
+        'quick_roles': {'labels_field': ('categorical', 0), 'values_field': ('numeric', 0)},
+        'quick_title': "Pie Chart: {values_field} by {labels_field}",
+        'requirement': "Need both numeric and categorical columns for a pie chart"
+    },
+    'line': {
+        'builder': ChartGenerator.create_line_chart,
+        'required': ('x_field', 'y_field'),
+        'optional': {'color_field': None, 'max_points': None},
+        'quick_roles': {'x_field': ('categorical', 0), 'y_field': ('numeric', 0)},
+        'quick_title': "Line Chart: {y_field} by {x_field}",
+        'requirement': "Need both numeric and categorical columns for a line chart"
+    },
+    'scatter': {
+        'builder': ChartGenerator.create_scatter_plot,
+        'required': ('x_field', 'y_field'),
+        'optional': {'color_field': None, 'size_field': None},
+        'quick_roles': {'x_field': ('numeric', 0), 'y_field': ('numeric', 1)},
+        'quick_title': "Scatter Plot: {y_field} vs {x_field}",
+        'requirement': "Need at least two numeric columns for a scatter plot"
+    },
+    'time_series': {
+        'builder': ChartGenerator.create_time_series,
+        'required': ('time_field', 'value_field'),
+        'optional': {'group_field': None, 'max_points': None},
+        'quick_roles': {'time_field': ('date', 0), 'value_field': ('numeric', 0)},
+        'quick_title': "Time Series: {value_field} over time",
+        'requirement': "Need a date column and a numeric column for a time series chart"
+    },
+    'statistics': {
+        'builder': ChartGenerator.create_statistics,
+        'required': ('value_field',),
+        'optional': {'group_field': None},
+        'quick_roles': {'value_field': ('numeric', 0)},
+        'quick_title': "Statistics for {value_field}",
+        'requirement': "Need at least one numeric column for statistics"
+    },
+    'gauge': {
+        'builder': ChartGenerator.create_gauge,
+        'required': ('value_field',),
+        'optional': {'min_value': None, 'max_value': None},
+        'quick_roles': {'value_field': ('numeric', 0)},
+        'quick_title': "Gauge: {value_field}",
+        'requirement': "Need at least one numeric column for a gauge chart"
+    },
+    'table': {
+        'builder': ChartGenerator.create_table,
+        'required': (),
+        'optional': {'columns': None, 'max_rows': 10},
+        'quick_roles': {},
+        'quick_title': "Data Table",
+        'requirement': ""
+    }
+}
+
+if tuple(CHART_REGISTRY) != CHART_TYPES:
+    raise RuntimeError(f"CHART_REGISTRY {tuple(CHART_REGISTRY)} does not match CHART_TYPES {CHART_TYPES}")
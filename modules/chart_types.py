@@ -0,0 +1,4 @@
+# Chart type names, kept free of Plotly so modules that only validate or
+# suggest chart types (such as async_llm) can import them cheaply. The order
+# matches CHART_REGISTRY in chart_generator, which checks the two agree.
+CHART_TYPES = ('bar', 'pie', 'line', 'scatter', 'time_series', 'statistics', 'gauge', 'table')
@@ -0,0 +1,69 @@
+import time
+import pandas as pd
+import plotly.graph_objects as go
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List
+from .chart_generator import ChartGenerator
+from .figure_cache import get_figure_cache
+
+# Builds overlap where pandas/NumPy aggregation releases the GIL, and they run
+# alongside the script thread streaming the spec. Plotly figure construction
+# holds the GIL, so its CPU work is not parallel across threads.
+_build_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='chart')
+
+
+class DashboardBuilder:
+    """Build every chart of a dashboard concurrently, returning results in layout order.
+
+    Each result is a dict with the chart ``spec``, the built ``figure`` (None on
+    failure), its figure cache ``key``, the build time in ``seconds`` and an
+    ``error`` message or None.
+    Figures go through the shared figure cache.
+    """
+
+    def __init__(self, chart_generator: ChartGenerator = None, use_cache: bool = True):
+        self.chart_generator = chart_generator or ChartGenerator()
+        self.use_cache = use_cache
+
+    def build_figure(self, data: pd.DataFrame, chart_spec: Dict[str, Any]) -> go.Figure:
+        """Build the Plotly figure for one chart spec"""
+        return self.chart_generator.create_chart(data, chart_spec)
+
+    def _build_timed(self, data: pd.DataFrame, chart_spec: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        cache = get_figure_cache()
+        result = {'spec': chart_spec, 'figure': None, 'error': None, 'key': None}
+        try:
+            # The figure key also identifies the chart's download payload
+            result['key'] = cache.make_key(data, chart_spec)
+            if self.use_cache:
+                result['figure'] = cache.get(result['key'])
+            if result['figure'] is None:
+                result['figure'] = self.build_figure(data, chart_spec)
+                if self.use_cache:
+                    cache.put(result['key'], result['figure'])
+        except Exception as e:
+            result['error'] = str(e)
+        result['seconds'] = time.perf_counter() - start
+        return result
+
+    def submit(self, data: pd.DataFrame, chart_spec: Dict[str, Any]) -> Future:
+        """Start building one chart in the worker pool"""
+        return _build_executor.submit(self._build_timed, data, chart_spec)
+
+    def build_all(self, data: pd.DataFrame, chart_specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build all charts concurrently and return their results in spec order"""
+        futures = [self.submit(data, chart_spec) for chart_spec in chart_specs]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def figure_html(fig: go.Figure, full_html: bool = True) -> str:
+        """Standalone page loading Plotly from the CDN, or a bare div when full_html is False"""
+        if full_html:
+            return fig.to_html(include_plotlyjs='cdn')
+        return fig.to_html(full_html=False, include_plotlyjs=False)
+
+    @staticmethod
+    def render_html(figures: List[go.Figure], full_html: bool = True) -> List[str]:
+        """Serialize figures to HTML"""
+        return [DashboardBuilder.figure_html(fig, full_html) for fig in figures]
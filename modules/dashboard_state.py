@@ -0,0 +1,53 @@
+import json
+from typing import Dict, Any, Callable, Iterable, List, Optional
+
+
+class DashboardState:
+    """Dependency-tracked values that survive Streamlit reruns.
+
+    Each node stores a value together with a key derived from its inputs,
+    and is recomputed only when those inputs change. The dashboard wires the
+    nodes as a DAG: data -> profile -> spec -> one node per chart, where
+    each chart node's inputs are the chart spec and the fingerprint of the
+    (filtered) data it is drawn from. The store is normally
+    ``st.session_state``, so every user session keeps its own nodes.
+    """
+
+    STORE_KEY = 'dashboard_state'
+
+    def __init__(self, store: Dict[str, Any]):
+        if DashboardState.STORE_KEY not in store:
+            store[DashboardState.STORE_KEY] = {}
+        self._nodes: Dict[str, Dict[str, Any]] = store[DashboardState.STORE_KEY]
+        # Names of the nodes recomputed during this run, for diagnostics
+        self.recomputed: List[str] = []
+
+    @staticmethod
+    def input_key(inputs: Dict[str, Any]) -> str:
+        return json.dumps(inputs, sort_keys=True, default=str)
+
+    def is_current(self, name: str, inputs: Dict[str, Any]) -> bool:
+        node = self._nodes.get(name)
+        return node is not None and node['key'] == DashboardState.input_key(inputs)
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return a node's last value regardless of its inputs, or None"""
+        node = self._nodes.get(name)
+        return node['value'] if node is not None else None
+
+    def set(self, name: str, inputs: Dict[str, Any], value: Any) -> Any:
+        self._nodes[name] = {'key': DashboardState.input_key(inputs), 'value': value}
+        self.recomputed.append(name)
+        return value
+
+    def resolve(self, name: str, inputs: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """Return the node's value, recomputing it only if its inputs changed"""
+        if self.is_current(name, inputs):
+            return self._nodes[name]['value']
+        return self.set(name, inputs, compute())
+
+    def prune(self, prefix: str, keep: Iterable[str] = ()) -> None:
+        """Drop the nodes whose name starts with prefix, except those in keep"""
+        keep = set(keep)
+        for name in [name for name in self._nodes if name.startswith(prefix) and name not in keep]:
+            del self._nodes[name]
@@ -1,14 +1,169 @@
+import os
 import pandas as pd
-import PyPDF2
-from typing import Union, Dict, Any
-import requests
-from io import StringIO, BytesIO
+import numpy as np
+from typing import Union, Dict, Any, Optional
+from io import BytesIO
+from .dtype_optimizer import DtypeOptimizer
+from .pdf_tables import PDFTableExtractor
+from .api_source import get_api_source
 
 class DataLoader:
+    # Files larger than this are read in chunks instead of in one pd.read_csv call
+    STREAMING_THRESHOLD_BYTES = 200 * 1024 * 1024
+    DEFAULT_CHUNKSIZE = 250_000
+    # Upper bound on rows kept in memory when streaming; extra rows are sampled
+    DEFAULT_STREAM_MAX_ROWS = 2_000_000
+
     @staticmethod
-    def load_csv(file_path: Union[str, BytesIO]) -> pd.DataFrame:
-        """Load data from CSV file"""
-        return pd.read_csv(file_path)
+    def load_csv(
+        file_path: Union[str, BytesIO],
+        chunksize: Optional[int] = None,
+        max_rows: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Load data from CSV file, optionally streaming it in chunks"""
+        if chunksize is None:
+            return pd.read_csv(file_path)
+        return DataLoader.load_csv_chunked(file_path, chunksize, max_rows)
+
+    @staticmethod
+    def load_csv_chunked(
+        file_path: Union[str, BytesIO],
+        chunksize: int = None,
+        max_rows: Optional[int] = None,
+        seed: int = 0
+    ) -> pd.DataFrame:
+        """Stream a CSV file in chunks with compact dtypes and a bounded row count.
+
+        Dtypes are inferred from the first chunk and applied to the rest of the
+        file; columns that become categoricals are read as text throughout, so
+        a later chunk of digit-only codes cannot change their dtype. Once more
+        than ``max_rows`` rows (default DEFAULT_STREAM_MAX_ROWS) have been
+        read, a uniform random sample of ``max_rows`` rows is kept, so peak
+        memory is bounded by ``2 * max_rows + chunksize`` rows. Exact row
+        counts and numeric column totals for the whole file, and the number of
+        rows kept, are stored in ``df.attrs['stream_summary']``; sums and counts
+        computed by Aggregator are scaled back up to the whole file from it.
+        """
+        chunksize = chunksize or DataLoader.DEFAULT_CHUNKSIZE
+        max_rows = max_rows or DataLoader.DEFAULT_STREAM_MAX_ROWS
+        rng = np.random.default_rng(seed)
+
+        first = pd.read_csv(file_path, nrows=chunksize)
+        if first.empty:
+            return pd.DataFrame()
+        dtypes = DataLoader._infer_chunk_dtypes(first)
+        if hasattr(file_path, 'seek'):
+            file_path.seek(0)
+        text_columns = {col: str for col, kind in dtypes.items() if kind == 'category'}
+        reader = pd.read_csv(file_path, chunksize=chunksize, dtype=text_columns)
+
+        summary = {'rows': 0, 'kept_rows': 0, 'sums': {}, 'sampled': False}
+
+        # Chunks are kept as separate pieces and concatenated once at the end.
+        # Bottom-k on random keys is a uniform sample without replacement: rows
+        # whose key is above the current k-th smallest can never be kept, so new
+        # chunks are filtered against it and the kept pieces are only re-pruned
+        # once they reach twice max_rows.
+        pieces = []
+        n_kept = 0
+        offset = 0
+        threshold = np.inf
+        for chunk in reader:
+            DataLoader._fold_chunk_summary(summary, chunk)
+            chunk = DataLoader._apply_chunk_dtypes(chunk, dtypes)
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            keys = rng.random(len(chunk))
+            if threshold < np.inf:
+                chunk, keys = chunk[keys <= threshold], keys[keys <= threshold]
+            pieces.append((chunk, keys))
+            n_kept += len(chunk)
+
+            if n_kept >= 2 * max_rows:
+                pieces, threshold = DataLoader._prune_pieces(pieces, max_rows)
+                n_kept = max_rows
+                summary['sampled'] = True
+
+        if n_kept > max_rows:
+            pieces, _ = DataLoader._prune_pieces(pieces, max_rows)
+            summary['sampled'] = True
+
+        frames = [frame for frame, _ in pieces]
+        kept = DataLoader._concat_chunks(frames) if len(frames) > 1 else frames[0]
+        kept = kept.reset_index(drop=True)
+        summary['kept_rows'] = len(kept)
+        kept.attrs['stream_summary'] = summary
+        return kept
+
+    @staticmethod
+    def _prune_pieces(pieces, max_rows: int):
+        """Keep the max_rows rows with the smallest keys, returning the pieces and the cut-off key"""
+        # Keys are unique with probability 1, so exactly max_rows rows survive
+        all_keys = np.concatenate([keys for _, keys in pieces])
+        threshold = np.partition(all_keys, max_rows - 1)[max_rows - 1]
+        pieces = [(frame[keys <= threshold], keys[keys <= threshold]) for frame, keys in pieces]
+        return [(frame, keys) for frame, keys in pieces if len(frame)], threshold
+
+    @staticmethod
+    def sample_notice(data: pd.DataFrame) -> Optional[str]:
+        """Describe the sampling of a streamed load, or None if every row was kept"""
+        summary = data.attrs.get('stream_summary') or {}
+        if not summary.get('sampled'):
+            return None
+        return (f"Large file: charts are computed from a uniform random sample of "
+                f"{summary['kept_rows']:,} of {summary['rows']:,} rows. Sums and counts are "
+                f"scaled up to the full file; other statistics are sample estimates.")
+
+    @staticmethod
+    def _infer_chunk_dtypes(chunk: pd.DataFrame) -> Dict[str, str]:
+        """Pick compact target dtypes for each column from the first chunk"""
+        dtypes = {}
+        for col in chunk.columns:
+            series = chunk[col]
+            if pd.api.types.is_integer_dtype(series):
+                dtypes[col] = 'integer'
+            elif pd.api.types.is_float_dtype(series):
+                dtypes[col] = 'float'
+            elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                n_unique = series.nunique(dropna=True)
+                if len(series) and n_unique / len(series) <= DtypeOptimizer.CATEGORY_RATIO:
+                    dtypes[col] = 'category'
+        return dtypes
+
+    @staticmethod
+    def _apply_chunk_dtypes(chunk: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+        """Downcast a chunk to the dtypes inferred from the first chunk"""
+        for col, kind in dtypes.items():
+            if col not in chunk.columns:
+                continue
+            if kind in ('integer', 'float'):
+                # A later chunk may hold floats or text in a column that looked
+                # integral at first, so fall back to whatever pandas parsed
+                if pd.api.types.is_numeric_dtype(chunk[col]):
+                    downcast = kind if pd.api.types.is_integer_dtype(chunk[col]) else 'float'
+                    chunk[col] = pd.to_numeric(chunk[col], downcast=downcast)
+            elif kind == 'category':
+                chunk[col] = chunk[col].astype('category')
+        return chunk
+
+    @staticmethod
+    def _concat_chunks(chunks) -> pd.DataFrame:
+        """Concatenate chunks, merging categoricals instead of falling back to object"""
+        frame = pd.concat(chunks)
+        for col in chunks[0].columns:
+            parts = [c[col] for c in chunks]
+            if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts) \
+                    and not isinstance(frame[col].dtype, pd.CategoricalDtype):
+                merged = pd.api.types.union_categoricals(parts)
+                frame[col] = pd.Categorical(frame[col], categories=merged.categories)
+        return frame
+
+    @staticmethod
+    def _fold_chunk_summary(summary: Dict[str, Any], chunk: pd.DataFrame) -> None:
+        """Add a chunk's row count and numeric totals to the running summary"""
+        summary['rows'] += len(chunk)
+        for col in chunk.select_dtypes(include=['number']).columns:
+            summary['sums'][col] = summary['sums'].get(col, 0) + float(chunk[col].sum())
 
     @staticmethod
     def load_excel(file_path: Union[str, BytesIO]) -> pd.DataFrame:
@@ -17,26 +172,32 @@ class DataLoader:
 
     @staticmethod
     def load_pdf(file_path: Union[str, BytesIO]) -> pd.DataFrame:
-        """Load data from PDF file"""
-        # TODO: Implement PDF data extraction
-        # This is a placeholder - actual implementation would need
-        # more sophisticated PDF parsing logic
-        pdf_reader = PyPDF2.PdfReader(file_path)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return pd.DataFrame({'text': [text]})
-
-    @staticmethod
-    def load_from_api(url: str, params: Dict[str, Any] = None) -> pd.DataFrame:
-        """Load data from API endpoint"""
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return pd.read_json(StringIO(response.text))
-
-    @staticmethod
-    def load_data(file_path: Union[str, BytesIO], file_type: str = None) -> pd.DataFrame:
-        """Load data from various file types"""
+        """Load the largest table in a PDF file, or its text if it has no tables"""
+        return PDFTableExtractor.extract(file_path)
+
+    @staticmethod
+    def load_from_api(url: str, params: Dict[str, Any] = None, **options) -> pd.DataFrame:
+        """Load data from API endpoint, see APIDataSource.fetch for pagination options"""
+        return get_api_source().fetch(url, params, **options)
+
+    @staticmethod
+    def get_size(file_path: Union[str, BytesIO]) -> Optional[int]:
+        """Return the size in bytes of a path, Streamlit upload or buffer"""
+        if isinstance(file_path, str):
+            return os.path.getsize(file_path) if os.path.exists(file_path) else None
+        if getattr(file_path, 'size', None) is not None:
+            return file_path.size
+        if hasattr(file_path, 'getbuffer'):
+            return file_path.getbuffer().nbytes
+        return None
+
+    @staticmethod
+    def load_data(
+        file_path: Union[str, BytesIO],
+        file_type: str = None,
+        optimize: bool = True
+    ) -> pd.DataFrame:
+        """Load data from various file types, compacting dtypes unless optimize is False"""
         # Handle Streamlit uploaded file
         if hasattr(file_path, 'name'):
             file_type = file_path.name.split('.')[-1].lower()
@@ -53,4 +214,18 @@ class DataLoader:
         if file_type not in loaders:
             raise ValueError(f"Unsupported file type: {file_type}")
 
-        return loaders[file_type](file_path) 
\ No newline at end of file
+        df = None
+        if file_type == 'csv':
+            size = DataLoader.get_size(file_path)
+            if size is not None and size > DataLoader.STREAMING_THRESHOLD_BYTES:
+                df = DataLoader.load_csv(
+                    file_path,
+                    chunksize=DataLoader.DEFAULT_CHUNKSIZE,
+                    max_rows=DataLoader.DEFAULT_STREAM_MAX_ROWS
+                )
+        if df is None:
+            df = loaders[file_type](file_path)
+
+        if optimize:
+            df = DtypeOptimizer.optimize(df)
+        return df
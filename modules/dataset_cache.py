@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import pandas as pd
+from io import BytesIO
+from typing import Union, Callable, Optional
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - cache is disabled without pyarrow
+    pa = None
+
+
+class DatasetCache:
+    """Content-addressed on-disk cache of parsed datasets stored as Arrow IPC files.
+
+    Each upload is parsed once and written as an uncompressed Arrow file, which
+    later reads memory-map instead of re-parsing CSV/Excel. Entries are evicted
+    least-recently-used first once the directory exceeds ``max_bytes``.
+    """
+
+    # Bump when loader output changes so stale entries are not reused
+    CACHE_VERSION = 3
+    DEFAULT_DIR = os.path.join('.cache', 'datasets')
+    DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+    HASH_BLOCK_SIZE = 1024 * 1024
+    SUFFIX = '.arrow'
+    ATTRS_KEY = b'dashboard_attrs'
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or DatasetCache.DEFAULT_DIR
+        self.max_bytes = max_bytes or DatasetCache.DEFAULT_MAX_BYTES
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return pa is not None
+
+    @staticmethod
+    def content_hash(source: Union[str, BytesIO]) -> str:
+        """Hash the raw bytes of a path, Streamlit upload or buffer"""
+        digest = hashlib.sha256()
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                for block in iter(lambda: f.read(DatasetCache.HASH_BLOCK_SIZE), b''):
+                    digest.update(block)
+        elif hasattr(source, 'getbuffer'):
+            digest.update(source.getbuffer())
+        else:
+            position = source.tell()
+            source.seek(0)
+            for block in iter(lambda: source.read(DatasetCache.HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+            source.seek(position)
+        return digest.hexdigest()
+
+    def _key(self, source: Union[str, BytesIO], file_type: Optional[str]) -> str:
+        name = getattr(source, 'name', source if isinstance(source, str) else '')
+        file_type = file_type or str(name).split('.')[-1].lower()
+        return f"{self.content_hash(source)}-{file_type}-v{DatasetCache.CACHE_VERSION}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + DatasetCache.SUFFIX)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame for a key, or None on a miss"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with pa.memory_map(path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+                df = table.to_pandas()
+            metadata = table.schema.metadata or {}
+            if DatasetCache.ATTRS_KEY in metadata:
+                df.attrs.update(json.loads(metadata[DatasetCache.ATTRS_KEY]))
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path, None)
+            return df
+        except Exception as e:
+            print(f"Error reading dataset cache entry {key}: {str(e)}")
+            return None
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Write a frame to the cache and evict old entries over budget"""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if df.attrs:
+                metadata = dict(table.schema.metadata or {})
+                metadata[DatasetCache.ATTRS_KEY] = json.dumps(df.attrs, default=str).encode()
+                table = table.replace_schema_metadata(metadata)
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Mixed-type object columns cannot always be converted to Arrow
+            print(f"Error writing dataset cache entry {key}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits its budget"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(DatasetCache.SUFFIX):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def get_or_load(
+        self,
+        source: Union[str, BytesIO],
+        loader: Callable[..., pd.DataFrame],
+        file_type: str = None
+    ) -> pd.DataFrame:
+        """Return the cached frame for this content, parsing and caching it on a miss"""
+        if not self.enabled:
+            return loader(source, file_type)
+
+        key = self._key(source, file_type)
+        start = time.perf_counter()
+        df = self.get(key)
+        if df is not None:
+            df.attrs['load_seconds'] = time.perf_counter() - start
+            df.attrs['cache_hit'] = True
+            return df
+
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        df = loader(source, file_type)
+        self.put(key, df)
+        df.attrs['load_seconds'] = time.perf_counter() - start
+        df.attrs['cache_hit'] = False
+        return df
+
+
+_dataset_cache = None
+_dataset_cache_lock = threading.Lock()
+
+
+def get_dataset_cache() -> DatasetCache:
+    """Return the process-wide dataset cache shared by all sessions"""
+    global _dataset_cache
+    if _dataset_cache is None:
+        with _dataset_cache_lock:
+            if _dataset_cache is None:
+                _dataset_cache = DatasetCache()
+    return _dataset_cache
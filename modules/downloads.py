@@ -0,0 +1,95 @@
+import html
+import threading
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from .dashboard_builder import DashboardBuilder
+
+
+def dashboard_page(title: str, chart_divs: List[str]) -> str:
+    """Wrap chart divs (rendered without Plotly JS) in one page that embeds Plotly JS once"""
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\" />\n"
+        f"<title>{html.escape(title)}</title>\n"
+        f"<script type=\"text/javascript\">{get_plotlyjs()}</script>\n"
+        "</head>\n<body>\n"
+        f"<h1>{html.escape(title)}</h1>\n"
+        + "\n".join(chart_divs)
+        + "\n</body>\n</html>"
+    )
+
+
+class DownloadCache:
+    """LRU cache of rendered HTML download payloads, keyed by figure key.
+
+    Payloads are only rendered when a user asks for a download, and each one
+    is rendered once per figure no matter how many sessions download it.
+    """
+
+    DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes or DownloadCache.DEFAULT_MAX_BYTES
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def _put(self, key: str, payload: str) -> None:
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def chart_html(self, key: str, fig: go.Figure) -> str:
+        """Standalone HTML for one chart, loading Plotly from the CDN"""
+        payload = self._get(key)
+        if payload is None:
+            payload = DashboardBuilder.figure_html(fig)
+            self._put(key, payload)
+        return payload
+
+    @staticmethod
+    def dashboard_key(chart_keys: List[str]) -> str:
+        return 'dashboard:' + '|'.join(chart_keys)
+
+    def dashboard_html(self, title: str, charts: List[Tuple[str, go.Figure]]) -> str:
+        """One self-contained HTML page for a whole dashboard, embedding Plotly JS once.
+
+        ``charts`` holds (figure key, figure) pairs in layout order.
+        """
+        key = DownloadCache.dashboard_key([chart_key for chart_key, _ in charts])
+        payload = self._get(key)
+        if payload is None:
+            divs = DashboardBuilder.render_html([fig for _, fig in charts], full_html=False)
+            payload = dashboard_page(title, divs)
+            self._put(key, payload)
+        return payload
+
+
+_download_cache = None
+_download_cache_lock = threading.Lock()
+
+
+def get_download_cache() -> DownloadCache:
+    """Return the process-wide download cache shared by all sessions"""
+    global _download_cache
+    if _download_cache is None:
+        with _download_cache_lock:
+            if _download_cache is None:
+                _download_cache = DownloadCache()
+    return _download_cache
@@ -0,0 +1,172 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional
+from .aggregation import Aggregator
+
+SUPPORTED_METHODS = ('lttb', 'minmax')
+
+
+class Downsampler:
+    """Reduce line and time-series data to a point budget before plotting.
+
+    Series at or below the budget are returned unchanged; larger ones are
+    reduced with largest-triangle-three-buckets (LTTB), which keeps the visual
+    shape, or a min/max envelope, which keeps every bucket's extremes. Lines
+    over a categorical x are summed per category instead, as bar charts are.
+    """
+
+    # Points kept per horizontal pixel of the chart
+    POINTS_PER_PIXEL = 2
+    DEFAULT_WIDTH = 1500
+
+    @staticmethod
+    def point_budget(width: int = None) -> int:
+        return (width or Downsampler.DEFAULT_WIDTH) * Downsampler.POINTS_PER_PIXEL
+
+    @staticmethod
+    def _as_float(values: pd.Series) -> Optional[np.ndarray]:
+        """Return x values as floats, or None if they are not numeric or datetime"""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values.to_numpy().astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return values.to_numpy(dtype=np.float64, na_value=np.nan)
+        return None
+
+    @staticmethod
+    def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+        """Indices of the points LTTB keeps; x must be sorted and n_out >= 3"""
+        n = len(x)
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+
+        # First and last points are always kept; the rest is split into n_out - 2 buckets
+        edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+        # Averages of each bucket act as the third triangle vertex for the previous bucket
+        counts = np.diff(edges)
+        x_means = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+        y_means = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+        x_means = np.append(x_means, x[-1])
+        y_means = np.append(y_means, y[-1])
+
+        selected = np.empty(n_out, dtype=np.int64)
+        selected[0] = 0
+        selected[-1] = n - 1
+        previous = 0
+        for bucket in range(n_out - 2):
+            start, stop = edges[bucket], edges[bucket + 1]
+            xs, ys = x[start:stop], y[start:stop]
+            # Twice the triangle area; the constant factor does not change the argmax
+            areas = np.abs(
+                (x[previous] - x_means[bucket + 1]) * (ys - y[previous])
+                - (x[previous] - xs) * (y_means[bucket + 1] - y[previous])
+            )
+            previous = start + int(np.argmax(areas))
+            selected[bucket + 1] = previous
+        return selected
+
+    @staticmethod
+    def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+        """Indices of the minimum and maximum of each of n_out // 2 equal buckets"""
+        n = len(y)
+        n_buckets = max(1, n_out // 2)
+        if n_out >= n:
+            return np.arange(n)
+
+        size = int(np.ceil(n / n_buckets))
+        padded = np.full(n_buckets * size, np.nan)
+        padded[:n] = y
+        padded = padded.reshape(n_buckets, size)
+        valid = ~np.all(np.isnan(padded), axis=1)
+        offsets = np.arange(n_buckets)[valid] * size
+        filled_min = np.where(np.isnan(padded[valid]), np.inf, padded[valid])
+        filled_max = np.where(np.isnan(padded[valid]), -np.inf, padded[valid])
+        mins = offsets + filled_min.argmin(axis=1)
+        maxs = offsets + filled_max.argmax(axis=1)
+        return np.unique(np.concatenate([mins, maxs, [0, n - 1]]))
+
+    @staticmethod
+    def downsample(
+        data: pd.DataFrame,
+        x_field: str,
+        y_field: str,
+        group_field: str = None,
+        n_out: int = None,
+        method: str = 'lttb'
+    ) -> pd.DataFrame:
+        """Downsample each group (or the whole frame) to at most about n_out points"""
+        if method not in SUPPORTED_METHODS:
+            raise ValueError(f"Unsupported downsampling method: {method}")
+        n_out = n_out or Downsampler.point_budget()
+
+        groups = data.groupby(group_field, observed=True, sort=False) if group_field else [(None, data)]
+        if all(len(group) <= n_out for _, group in groups):
+            return data
+        if not pd.api.types.is_numeric_dtype(data[y_field]):
+            return data
+        if Downsampler._as_float(data[x_field]) is None:
+            return Downsampler._categorical_budget(data, x_field, y_field, group_field, n_out)
+
+        parts = []
+        for _, group in groups:
+            if len(group) <= n_out:
+                parts.append(group)
+                continue
+            group = group.dropna(subset=[x_field, y_field]).sort_values(x_field, kind='stable')
+            x = Downsampler._as_float(group[x_field])
+            y = group[y_field].to_numpy(dtype=np.float64)
+            if method == 'lttb':
+                keep = Downsampler.lttb_indices(x, y, n_out)
+            else:
+                keep = Downsampler.minmax_indices(y, n_out)
+            parts.append(group.iloc[keep])
+        return pd.concat(parts)
+
+    @staticmethod
+    def _categorical_budget(
+        data: pd.DataFrame,
+        x_field: str,
+        y_field: str,
+        group_field: Optional[str],
+        n_out: int
+    ) -> pd.DataFrame:
+        """Sum y per category, then keep evenly spaced categories of any line still over budget"""
+        data = Aggregator.aggregate(data, [x_field, group_field], y_field, 'sum')
+        parts = []
+        groups = data.groupby(group_field, observed=True, sort=False) if group_field else [(None, data)]
+        for _, group in groups:
+            if len(group) > n_out:
+                group = group.iloc[np.unique(np.linspace(0, len(group) - 1, n_out).astype(np.int64))]
+            parts.append(group)
+        return pd.concat(parts) if parts else data
+
+
+def benchmark(n_points: int = 1_000_000, n_out: int = 3000, seed: int = 0) -> None:
+    """Print speed and fidelity of both methods on a noisy random walk.
+
+    Fidelity is reported as the share of the full series' value range covered
+    by the sample and the mean absolute error of the sample re-interpolated
+    onto the original x values.
+    """
+    rng = np.random.default_rng(seed)
+    x = np.arange(n_points, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=n_points)) + rng.normal(scale=5, size=n_points)
+    value_range = y.max() - y.min()
+
+    for method in SUPPORTED_METHODS:
+        start = time.perf_counter()
+        if method == 'lttb':
+            keep = Downsampler.lttb_indices(x, y, n_out)
+        else:
+            keep = Downsampler.minmax_indices(y, n_out)
+        elapsed = time.perf_counter() - start
+        coverage = (y[keep].max() - y[keep].min()) / value_range
+        error = np.mean(np.abs(np.interp(x, x[keep], y[keep]) - y)) / value_range
+        print(
+            f"{method:>6}: {n_points:,} -> {len(keep):,} points in {elapsed * 1000:.1f} ms, "
+            f"range coverage {coverage:.1%}, mean abs error {error:.2%} of range"
+        )
+
+
+if __name__ == '__main__':
+    benchmark()
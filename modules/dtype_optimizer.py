@@ -0,0 +1,117 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, Any
+
+
+class DtypeOptimizer:
+    # String columns with at most this share of distinct values become categoricals
+    CATEGORY_RATIO = 0.5
+    # Number of non-null values inspected when deciding whether a column holds dates
+    DATE_SAMPLE_SIZE = 1000
+    # Share of sampled values that must parse for a column to be reported as dates
+    # (see DatasetProfiler); optimize only converts columns where every value parses
+    DATE_MIN_SUCCESS = 0.95
+
+    @staticmethod
+    def optimize(df: pd.DataFrame) -> pd.DataFrame:
+        """Return a compact version of df with categoricals, downcast numerics and parsed dates.
+
+        The result is assembled column by column without consolidating blocks,
+        so unchanged columns share memory with df and peak memory only grows
+        by the converted columns, not by a full copy of the frame. A summary
+        of the conversion is stored in ``df.attrs['memory_report']``.
+        """
+        before = int(df.memory_usage(deep=True).sum())
+        columns = []
+        converted = {}
+
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            new_series = DtypeOptimizer.optimize_series(series)
+            if new_series is not series and new_series.dtype != series.dtype:
+                converted[str(col)] = f"{series.dtype} -> {new_series.dtype}"
+                series = new_series
+            columns.append(series)
+
+        # Keyed by position so duplicate column names survive
+        optimized = pd.DataFrame(dict(enumerate(columns)), index=df.index, copy=False)
+        optimized.columns = df.columns
+        optimized.attrs.update(df.attrs)
+
+        after = int(optimized.memory_usage(deep=True).sum())
+        optimized.attrs['memory_report'] = {
+            'before_bytes': before,
+            'after_bytes': after,
+            'saved_bytes': before - after,
+            'converted': converted
+        }
+        return optimized
+
+    @staticmethod
+    def optimize_series(series: pd.Series) -> pd.Series:
+        """Return the most compact lossless representation of a single column"""
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series):
+            return series
+        if pd.api.types.is_integer_dtype(series):
+            return pd.to_numeric(series, downcast='integer')
+        if pd.api.types.is_float_dtype(series):
+            return DtypeOptimizer._downcast_float(series)
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            dates = DtypeOptimizer._parse_dates(series)
+            if dates is not None:
+                return dates
+            n_unique = series.nunique(dropna=True)
+            if len(series) and n_unique / len(series) <= DtypeOptimizer.CATEGORY_RATIO:
+                return series.astype('category')
+        return series
+
+    @staticmethod
+    def _downcast_float(series: pd.Series) -> pd.Series:
+        """Downcast floats only when no precision is lost"""
+        values = series.to_numpy()
+        finite = values[~np.isnan(values)]
+        if len(finite) == len(values) and len(values) and np.array_equal(finite, np.round(finite)) \
+                and np.abs(finite).max() < 2 ** 53:
+            return pd.to_numeric(series.astype('int64'), downcast='integer')
+        as_float32 = values.astype(np.float32)
+        if np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True):
+            return series.astype(np.float32)
+        return series
+
+    @staticmethod
+    def _parse_dates(series: pd.Series):
+        """Parse a text column as datetimes only if every non-null value is a date.
+
+        Coercing would turn unparseable values into NaT, so a single failure
+        keeps the column as text.
+        """
+        sample = series.dropna()
+        if sample.empty:
+            return None
+        sample = sample.iloc[:DtypeOptimizer.DATE_SAMPLE_SIZE].astype(str)
+        # Plain numbers would otherwise be read as epoch offsets or years
+        if pd.to_numeric(sample, errors='coerce').notna().mean() > 0.5:
+            return None
+        if not sample.str.contains(r'\d').all():
+            return None
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            # The sample is a cheap early exit before parsing the whole column
+            if not pd.to_datetime(sample, errors='coerce').notna().all():
+                return None
+            parsed = pd.to_datetime(series, errors='coerce')
+
+        # Reject the conversion if any value outside the sample failed to parse
+        if (parsed.isna() & series.notna()).any():
+            return None
+        return parsed
+
+    @staticmethod
+    def format_report(report: Dict[str, Any]) -> str:
+        """Render a memory report as a short human readable sentence"""
+        before_mb = report['before_bytes'] / 1024 / 1024
+        after_mb = report['after_bytes'] / 1024 / 1024
+        saved = report['saved_bytes'] / report['before_bytes'] * 100 if report['before_bytes'] else 0
+        return f"Memory: {before_mb:.1f} MB -> {after_mb:.1f} MB ({saved:.0f}% saved)"
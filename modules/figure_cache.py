@@ -0,0 +1,148 @@
+import json
+import hashlib
+import weakref
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, Callable, Optional, Tuple
+
+if TYPE_CHECKING:
+    # Plotly is only needed to decode cached figures, so the profiler and
+    # prompt builder can fingerprint frames without importing it
+    import plotly.graph_objects as go
+
+
+class FigureCache:
+    """In-memory LRU cache of built Plotly figures, shared by every session.
+
+    Entries are keyed on a fingerprint of the dataset content plus the
+    normalized chart spec and stored as figure JSON, so each hit returns a
+    fresh figure that callers may restyle without affecting the cache. The
+    total size of the stored JSON is kept under ``max_bytes``.
+    """
+
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes or FigureCache.DEFAULT_MAX_BYTES
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[int, Tuple[weakref.ref, str]] = {}
+        # Guards the memo; a per-frame lock makes concurrent callers wait for one hash
+        self._fingerprint_lock = threading.Lock()
+        self._hashing: Dict[int, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def dataset_fingerprint(self, data: pd.DataFrame) -> str:
+        """Hash a dataset's columns, dtypes and values, once per frame object.
+
+        The memo is keyed on object identity rather than ``attrs``, because
+        pandas copies ``attrs`` onto filtered and derived frames. Builder
+        threads asking for the same frame at once wait for a single hash.
+        """
+        with self._fingerprint_lock:
+            fingerprint = self._memoized_fingerprint(data)
+            if fingerprint is not None:
+                return fingerprint
+            frame_lock = self._hashing.setdefault(id(data), threading.Lock())
+        try:
+            with frame_lock:
+                with self._fingerprint_lock:
+                    fingerprint = self._memoized_fingerprint(data)
+                if fingerprint is None:
+                    digest = hashlib.sha256()
+                    digest.update('|'.join(
+                        f"{col}:{dtype}" for col, dtype in data.dtypes.astype(str).items()
+                    ).encode())
+                    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+                    fingerprint = digest.hexdigest()
+                    self.register_fingerprint(data, fingerprint)
+        finally:
+            with self._fingerprint_lock:
+                self._hashing.pop(id(data), None)
+        return fingerprint
+
+    def _memoized_fingerprint(self, data: pd.DataFrame) -> Optional[str]:
+        entry = self._fingerprints.get(id(data))
+        if entry is not None and entry[0]() is data:
+            return entry[1]
+        return None
+
+    def register_fingerprint(self, data: pd.DataFrame, fingerprint: str) -> None:
+        """Record a known fingerprint for a frame, e.g. one derived from its source and a filter"""
+        with self._fingerprint_lock:
+            is_new = self._memoized_fingerprint(data) is None
+            self._fingerprints[id(data)] = (weakref.ref(data), fingerprint)
+        if is_new:
+            # One finalizer per frame; dict.pop needs no lock, so it is safe to run during GC
+            weakref.finalize(data, self._fingerprints.pop, id(data), None)
+
+    @staticmethod
+    def normalize_spec(chart_spec: Dict[str, Any]) -> str:
+        return json.dumps(chart_spec, sort_keys=True, default=str)
+
+    def make_key(self, data: pd.DataFrame, chart_spec: Dict[str, Any]) -> str:
+        raw = f"{self.dataset_fingerprint(data)}\n{FigureCache.normalize_spec(chart_spec)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional['go.Figure']:
+        """Return a fresh copy of the cached figure, or None on a miss"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        import plotly.io as pio
+        return pio.from_json(payload)
+
+    def put(self, key: str, fig: 'go.Figure') -> None:
+        """Store a figure and evict least recently used entries over budget"""
+        payload = fig.to_json()
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get_or_build(
+        self,
+        data: pd.DataFrame,
+        chart_spec: Dict[str, Any],
+        builder: Callable[[], 'go.Figure']
+    ) -> 'go.Figure':
+        """Return the cached figure for this dataset and spec, building and caching it on a miss"""
+        key = self.make_key(data, chart_spec)
+        fig = self.get(key)
+        if fig is None:
+            fig = builder()
+            self.put(key, fig)
+        return fig
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_figure_cache = None
+_figure_cache_lock = threading.Lock()
+
+
+def get_figure_cache() -> FigureCache:
+    """Return the process-wide figure cache shared by all sessions"""
+    global _figure_cache
+    if _figure_cache is None:
+        with _figure_cache_lock:
+            if _figure_cache is None:
+                _figure_cache = FigureCache()
+    return _figure_cache
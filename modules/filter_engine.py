@@ -0,0 +1,104 @@
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from .figure_cache import get_figure_cache
+
+
+class FilterEngine:
+    """Apply dashboard filter selections using per-column code indexes.
+
+    Each filtered column is factorized once into integer codes. A selection
+    becomes a small lookup table over those codes, so filtering is one
+    vectorized gather per column and an AND across columns, with no string
+    comparisons against the data.
+    """
+
+    # Columns with more distinct values than this are not offered as filters
+    MAX_OPTIONS = 1000
+
+    def __init__(self, data: pd.DataFrame, fingerprint: str = None):
+        self.data = data
+        self.fingerprint = fingerprint or get_figure_cache().dataset_fingerprint(data)
+        self._indexes: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+        self._lock = threading.Lock()
+
+    def index(self, column: str) -> Tuple[np.ndarray, pd.Index]:
+        """Return (codes, uniques) for a column, building them on first use"""
+        with self._lock:
+            if column not in self._indexes:
+                codes, uniques = pd.factorize(self.data[column], sort=True)
+                self._indexes[column] = (codes, pd.Index(uniques))
+            return self._indexes[column]
+
+    def options(self, column: str) -> Optional[List[Any]]:
+        """Distinct values of a column, or None if there are too many to filter on"""
+        _, uniques = self.index(column)
+        if len(uniques) > FilterEngine.MAX_OPTIONS:
+            return None
+        return uniques.tolist()
+
+    def active_selections(self, selections: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """Drop selections that keep every value, since they do not filter anything"""
+        active = {}
+        for column, selected in selections.items():
+            _, uniques = self.index(column)
+            if len(set(selected)) < len(uniques):
+                active[column] = list(selected)
+        return active
+
+    def mask(self, selections: Dict[str, List[Any]]) -> Optional[np.ndarray]:
+        """Boolean row mask for the selections, or None when nothing is filtered"""
+        mask = None
+        for column, selected in self.active_selections(selections).items():
+            codes, uniques = self.index(column)
+            # The extra last slot is indexed by the -1 code of missing values
+            lookup = np.zeros(len(uniques) + 1, dtype=bool)
+            positions = uniques.get_indexer(selected)
+            lookup[positions[positions >= 0]] = True
+            column_mask = lookup[codes]
+            mask = column_mask if mask is None else mask & column_mask
+        return mask
+
+    def selection_key(self, selections: Dict[str, List[Any]]) -> str:
+        """Canonical description of the active selections"""
+        active = self.active_selections(selections)
+        canonical = {column: sorted(map(str, selected)) for column, selected in sorted(active.items())}
+        return json.dumps(canonical, sort_keys=True)
+
+    def apply(self, selections: Dict[str, List[Any]]) -> pd.DataFrame:
+        """Return the filtered frame, registered with the figure cache under a derived fingerprint.
+
+        The derived fingerprint combines the dataset fingerprint with the
+        selections, so figure caching does not rehash the filtered rows.
+        """
+        mask = self.mask(selections)
+        if mask is None:
+            return self.data
+        filtered = self.data[mask]
+        digest = hashlib.sha256(self.selection_key(selections).encode('utf-8')).hexdigest()
+        get_figure_cache().register_fingerprint(filtered, f"{self.fingerprint}:{digest}")
+        return filtered
+
+
+_filter_engines: 'OrderedDict[str, FilterEngine]' = OrderedDict()
+_filter_engines_lock = threading.Lock()
+# Each engine keeps its dataset alive, so only the most recent few are kept
+MAX_FILTER_ENGINES = 4
+
+
+def get_filter_engine(data: pd.DataFrame) -> FilterEngine:
+    """Return the shared engine for this dataset's content, reusing its indexes across reruns"""
+    fingerprint = get_figure_cache().dataset_fingerprint(data)
+    with _filter_engines_lock:
+        engine = _filter_engines.get(fingerprint)
+        if engine is None:
+            engine = FilterEngine(data, fingerprint)
+            _filter_engines[fingerprint] = engine
+            while len(_filter_engines) > MAX_FILTER_ENGINES:
+                _filter_engines.popitem(last=False)
+        _filter_engines.move_to_end(fingerprint)
+        return engine
@@ -0,0 +1,314 @@
+import re
+import math
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+# Phrases that name a chart type, checked longest first so "time series" wins over "series"
+CHART_KEYWORDS = {
+    'time_series': ['time series', 'timeseries', 'over time', 'trend'],
+    'statistics': ['statistics', 'stats', 'summary statistics'],
+    'gauge': ['gauge', 'kpi', 'indicator'],
+    'table': ['table'],
+    'scatter': ['scatter plot', 'scatter', 'scatterplot'],
+    'pie': ['pie chart', 'pie', 'donut'],
+    'line': ['line chart', 'line graph', 'line'],
+    'bar': ['bar chart', 'bar graph', 'bar', 'column chart', 'histogram']
+}
+
+# Chart types the dashboard cannot draw. They still end the previous clause, so
+# their fields are not attached to a neighbouring chart, and they force the LLM path.
+UNSUPPORTED = 'unsupported'
+UNSUPPORTED_CHART_WORDS = [
+    'heatmap', 'heat map', 'treemap', 'tree map', 'funnel', 'area chart', 'box plot', 'boxplot',
+    'violin', 'sankey', 'radar', 'waterfall', 'candlestick', 'bubble chart', 'choropleth'
+]
+
+# Phrases that turn a neighbouring line/bar request into a time series
+TIME_MODIFIERS = {'over time', 'trend'}
+
+# Words that pick a bar/pie aggregation other than the default sum
+AGGREGATE_WORDS = {
+    'mean': re.compile(r'\b(average|avg|mean)\b', re.IGNORECASE),
+    'median': re.compile(r'\bmedian\b', re.IGNORECASE),
+    'count': re.compile(r'\b(count|number of)\b', re.IGNORECASE),
+    'max': re.compile(r'\b(max|maximum|highest)\b', re.IGNORECASE),
+    'min': re.compile(r'\b(min|minimum|lowest)\b', re.IGNORECASE)
+}
+
+# Ranking and limits ("top 5", "sorted by") are not expressible in a chart spec
+LIMIT_WORDS = re.compile(
+    r'\b(top|bottom|first|last|largest|smallest|biggest|sort|sorted|order|ordered|ascending|'
+    r'descending|rank|ranked|ranking|limit|only|excluding|except|where)\b|\d',
+    re.IGNORECASE
+)
+
+# Words a clause may contain besides chart keywords and column names without
+# changing its meaning; anything else is text the parser did not understand
+FILLER_WORDS = {
+    'a', 'an', 'the', 'of', 'by', 'per', 'across', 'for', 'each', 'vs', 'versus', 'against',
+    'with', 'and', 'or', 'to', 'in', 'on', 'from', 'as', 'at', 'into', 'between',
+    'show', 'shows', 'showing', 'shown', 'display', 'displaying', 'plot', 'plotted', 'plotting',
+    'chart', 'charts', 'graph', 'graphs', 'visual', 'visualization', 'visualisation', 'visualize',
+    'visualise', 'create', 'make', 'add', 'include', 'includes', 'including', 'draw', 'give',
+    'want', 'need', 'would', 'like', 'i', 'me', 'we', 'us', 'my', 'our', 'please', 'also', 'then',
+    'plus', 'can', 'could', 'should', 'will', 'be', 'is', 'are', 'it', 'its', 'that', 'this',
+    'which', 'see', 'compare', 'comparing', 'comparison', 'total', 'totals', 'sum', 'sums',
+    'overall', 'grouped', 'group', 'groups', 'grouping', 'split', 'broken', 'down', 'breakdown',
+    'colored', 'coloured', 'color', 'colour', 'segmented', 'stacked', 'dashboard', 'data',
+    'values', 'value', 'distribution', 'average', 'avg', 'mean', 'median', 'count', 'number',
+    'max', 'maximum', 'highest', 'min', 'minimum', 'lowest', 'summary'
+}
+# Confidence for clauses with words or columns the parser ignored, below the LLM fallback threshold
+PARTIAL_CONFIDENCE = 0.5
+
+# Spec keys that hold the columns a chart draws
+FIELD_KEYS = (
+    'x_field', 'y_field', 'color_field', 'labels_field', 'values_field',
+    'time_field', 'value_field', 'group_field'
+)
+
+# Clause boundaries between two chart requests in the same sentence
+CLAUSE_BREAK = re.compile(r',|\band\b|\bthen\b|\bplus\b|\balso\b', re.IGNORECASE)
+SENTENCE_BREAK = re.compile(r'[.;\n]+')
+FILTER_CLAUSE = re.compile(r'\bfilters?\b(.*)', re.IGNORECASE)
+
+
+class HeuristicSpecParser:
+    """Rule-based parser that turns simple prompts into dashboard specs without an LLM.
+
+    It matches chart-type keywords and the DataFrame's column names and
+    returns the same spec dict the LLM produces, together with a confidence
+    score in [0, 1]. Callers fall back to the LLM when confidence is low.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.columns = [str(col) for col in data.columns]
+        self.numeric = set()
+        self.categorical = set()
+        self.datetime = set()
+        for col in data.columns:
+            series = data[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                self.datetime.add(str(col))
+            elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                self.numeric.add(str(col))
+            else:
+                self.categorical.add(str(col))
+                if re.search(r'date|time', str(col), re.IGNORECASE):
+                    self.datetime.add(str(col))
+        self._column_patterns = [
+            (col, HeuristicSpecParser._column_pattern(col))
+            for col in sorted(self.columns, key=len, reverse=True)
+        ]
+        keywords = [
+            (chart_type, keyword)
+            for chart_type, words in CHART_KEYWORDS.items()
+            for keyword in words
+        ] + [(UNSUPPORTED, keyword) for keyword in UNSUPPORTED_CHART_WORDS]
+        keywords.sort(key=lambda item: len(item[1]), reverse=True)
+        self._keyword_pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(k) for _, k in keywords) + r')\b',
+            re.IGNORECASE
+        )
+        self._keyword_types = {k: t for t, k in keywords}
+
+    @staticmethod
+    def _column_pattern(col: str) -> re.Pattern:
+        """Match a column name case-insensitively, with spaces/underscores and a plural s"""
+        words = [re.escape(w) for w in re.split(r'[\s_]+', col.strip()) if w]
+        return re.compile(r'\b' + r'[\s_]+'.join(words) + r's?\b', re.IGNORECASE)
+
+    def _find_columns(self, text: str) -> List[Tuple[int, str]]:
+        """Return (position, column) for every column mentioned in text, longest names first"""
+        taken = [False] * len(text)
+        mentions = []
+        for col, pattern in self._column_patterns:
+            for match in pattern.finditer(text):
+                if any(taken[match.start():match.end()]):
+                    continue
+                taken[match.start():match.end()] = [True] * (match.end() - match.start())
+                mentions.append((match.start(), col))
+        return sorted(mentions)
+
+    def _segments(self, text: str) -> List[Tuple[str, str]]:
+        """Split text into (chart_type, clause) pairs, one per chart keyword"""
+        segments = []
+        for sentence in SENTENCE_BREAK.split(text):
+            if FILTER_CLAUSE.search(sentence) and not self._keyword_pattern.search(
+                    FILTER_CLAUSE.split(sentence)[0]):
+                continue
+            # [chart_type, keyword_start, keyword_end, is_modifier]
+            matches = []
+            for match in self._keyword_pattern.finditer(sentence):
+                keyword = match.group(1).lower()
+                is_modifier = keyword in TIME_MODIFIERS
+                if matches and (is_modifier or matches[-1][3]) and matches[-1][0] != UNSUPPORTED \
+                        and not CLAUSE_BREAK.search(sentence[matches[-1][2]:match.start()]):
+                    # "line chart of Sales over time" is one time series, not two charts
+                    matches[-1] = ['time_series', matches[-1][1], match.end(), False]
+                    continue
+                matches.append([self._keyword_types[keyword], match.start(), match.end(), is_modifier])
+
+            start = 0
+            for i, (chart_type, _, keyword_end, _) in enumerate(matches):
+                end = len(sentence)
+                if i + 1 < len(matches):
+                    # Cut at the last clause break before the next keyword, or right before it
+                    between = sentence[keyword_end:matches[i + 1][1]]
+                    breaks = list(CLAUSE_BREAK.finditer(between))
+                    end = keyword_end + breaks[-1].start() if breaks else matches[i + 1][1]
+                segments.append((chart_type, sentence[start:end]))
+                start = end
+        return segments
+
+    def _roles(self, clause: str) -> Dict[str, List[str]]:
+        """Split the columns in a clause into measures and dimensions around 'by'/'vs'"""
+        mentions = self._find_columns(clause)
+        split = re.search(r'\b(by|per|across|for each|vs\.?|versus|against)\b', clause, re.IGNORECASE)
+        before = [col for pos, col in mentions if not split or pos < split.start()]
+        after = [col for pos, col in mentions if split and pos >= split.start()]
+        return {
+            'all': [col for _, col in mentions],
+            'before': before,
+            'after': after,
+            'numeric': [col for _, col in mentions if col in self.numeric],
+            'categorical': [col for _, col in mentions if col in self.categorical and col not in self.datetime],
+            'datetime': [col for _, col in mentions if col in self.datetime]
+        }
+
+    @staticmethod
+    def _first(candidates: List[str], exclude: List[str] = ()) -> Optional[str]:
+        for col in candidates:
+            if col not in exclude:
+                return col
+        return None
+
+    def _clause_confidence(self, clause: str) -> float:
+        """Confidence that a clause was fully understood, judged by the text left once
+        chart keywords and column names are removed"""
+        text = self._keyword_pattern.sub(' ', clause)
+        for _, pattern in self._column_patterns:
+            text = pattern.sub(' ', text)
+        unparsed = [word for word in re.findall(r'[a-z]+', text.lower()) if word not in FILLER_WORDS]
+        if unparsed or LIMIT_WORDS.search(text):
+            return PARTIAL_CONFIDENCE
+        return 1.0
+
+    def _build_chart(self, chart_type: str, clause: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Build one chart spec from a clause and return it with its confidence"""
+        if chart_type == UNSUPPORTED:
+            return None, 0.0
+        roles = self._roles(clause)
+        numeric, categorical, dates = roles['numeric'], roles['categorical'], roles['datetime']
+        value = self._first([c for c in roles['before'] if c in self.numeric]) or self._first(numeric)
+        group = self._first([c for c in roles['after'] if c in categorical]) or self._first(categorical)
+        second_group = self._first(categorical, [group])
+        confidence = self._clause_confidence(clause)
+        chart = {'type': chart_type}
+
+        if chart_type in ('bar', 'line'):
+            x = group
+            if chart_type == 'line' and dates:
+                x = dates[0]
+            if not (value and x):
+                return None, 0.0
+            chart.update({'x_field': x, 'y_field': value, 'title': f"{value} by {x}"})
+            if second_group and second_group != x:
+                chart['color_field'] = second_group
+        elif chart_type == 'pie':
+            if not (value and group):
+                return None, 0.0
+            chart.update({'labels_field': group, 'values_field': value, 'title': f"{value} by {group}"})
+        elif chart_type == 'scatter':
+            if len(numeric) < 2:
+                return None, 0.0
+            # "Profit vs Sales" plots Profit on y against Sales on x
+            y, x = numeric[0], numeric[1]
+            chart.update({'x_field': x, 'y_field': y, 'title': f"{y} vs {x}"})
+            if group:
+                chart['color_field'] = group
+        elif chart_type == 'time_series':
+            time_field = dates[0] if dates else self._first(sorted(self.datetime))
+            if not (value and time_field):
+                return None, 0.0
+            if not dates:
+                # The time column was inferred from dtypes rather than named
+                confidence = min(confidence, 0.85)
+            chart.update({'time_field': time_field, 'value_field': value, 'title': f"{value} Over Time"})
+            if group:
+                chart['group_field'] = group
+        elif chart_type == 'statistics':
+            if not value:
+                return None, 0.0
+            chart.update({'value_field': value, 'title': f"{value} Statistics"})
+            if group:
+                chart['group_field'] = group
+                chart['title'] = f"{value} Statistics by {group}"
+        elif chart_type == 'gauge':
+            if not value:
+                return None, 0.0
+            chart.update({'value_field': value, 'title': f"{value} Gauge"})
+        elif chart_type == 'table':
+            chart['title'] = "Data Table"
+            if roles['all']:
+                chart['columns'] = roles['all']
+
+        # A column the prompt mentioned but the chart does not draw means the
+        # request was not fully understood
+        used = {chart.get(key) for key in FIELD_KEYS} | set(chart.get('columns', ()))
+        if any(col not in used for col in roles['all']):
+            confidence = min(confidence, PARTIAL_CONFIDENCE)
+
+        if chart_type in ('bar', 'pie'):
+            for aggregate, pattern in AGGREGATE_WORDS.items():
+                if pattern.search(clause):
+                    chart['aggregate'] = aggregate
+                    break
+        return chart, confidence
+
+    def _filters(self, text: str) -> List[str]:
+        filters = []
+        for sentence in SENTENCE_BREAK.split(text):
+            match = FILTER_CLAUSE.search(sentence)
+            if match:
+                filters.extend(col for _, col in self._find_columns(match.group(1)) if col not in filters)
+        return filters
+
+    def parse(self, spec_text: str) -> Tuple[Dict[str, Any], float]:
+        """Parse a prompt into a dashboard spec and a confidence score"""
+        charts = []
+        confidence = 1.0
+        for chart_type, clause in self._segments(spec_text):
+            chart, chart_confidence = self._build_chart(chart_type, clause)
+            confidence = min(confidence, chart_confidence)
+            if chart is not None:
+                charts.append(chart)
+
+        if not charts:
+            confidence = 0.0
+
+        # Make titles unique since the layout refers to charts by title
+        seen = {}
+        for chart in charts:
+            base = chart['title']
+            seen[base] = seen.get(base, 0) + 1
+            if seen[base] > 1:
+                chart['title'] = f"{base} ({seen[base]})"
+
+        columns = 2 if len(charts) > 1 else 1
+        rows = max(1, math.ceil(len(charts) / columns))
+        spec = {
+            "dashboard_title": "Dashboard",
+            "charts": charts,
+            "layout": {
+                "rows": rows,
+                "columns": columns,
+                "chart_positions": [
+                    {"chart": chart['title'], "row": i // columns + 1, "column": i % columns + 1}
+                    for i, chart in enumerate(charts)
+                ]
+            },
+            "filters": self._filters(spec_text),
+            "notes": "Parsed locally without the LLM"
+        }
+        return spec, confidence
@@ -0,0 +1,125 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class IncrementalSpecParser:
+    """Parse a dashboard spec JSON object incrementally as text chunks arrive.
+
+    ``feed`` returns events as soon as the matching JSON value is complete:
+    ``('layout', dict)`` for the top-level layout object and ``('chart', dict)``
+    for each entry in the top-level ``charts`` array. Text before the opening
+    brace (such as a Markdown code fence) and after the closing brace is
+    ignored. ``result`` returns the whole spec once the object has closed.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._length = 0
+        self._text_cache = ''
+        # Each frame: {'type': 'obj'|'arr', 'start': int, 'key': parent key,
+        # 'current_key': str, 'expect_key': bool}
+        self._stack: List[Dict[str, Any]] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._top_start = None
+        self._top_end = None
+
+    def _text(self) -> str:
+        if len(self._text_cache) != self._length:
+            self._text_cache = ''.join(self._buffer)
+            self._buffer = [self._text_cache]
+        return self._text_cache
+
+    @property
+    def done(self) -> bool:
+        return self._top_end is not None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Consume a chunk of text and return any newly completed events"""
+        if self.done or not chunk:
+            return []
+        offset = self._length
+        self._buffer.append(chunk)
+        self._length += len(chunk)
+
+        events = []
+        for i, ch in enumerate(chunk):
+            pos = offset + i
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(pos)
+                continue
+
+            if not self._stack:
+                if ch == '{':
+                    self._top_start = pos
+                    self._push('obj', pos)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch == '{':
+                self._push('obj', pos)
+            elif ch == '[':
+                self._push('arr', pos)
+            elif ch in '}]':
+                event = self._pop(pos)
+                if event is not None:
+                    events.append(event)
+                if not self._stack:
+                    self._top_end = pos
+                    break
+            elif ch == ',':
+                frame = self._stack[-1]
+                if frame['type'] == 'obj':
+                    frame['expect_key'] = True
+        return events
+
+    def _push(self, kind: str, pos: int) -> None:
+        parent = self._stack[-1] if self._stack else None
+        key = parent['current_key'] if parent and parent['type'] == 'obj' else None
+        if parent and parent['type'] == 'arr':
+            key = parent['key']
+        self._stack.append({
+            'type': kind,
+            'start': pos,
+            'key': key,
+            'current_key': None,
+            'expect_key': kind == 'obj'
+        })
+
+    def _close_string(self, pos: int) -> None:
+        frame = self._stack[-1]
+        if frame['type'] == 'obj' and frame['expect_key']:
+            frame['current_key'] = json.loads(self._text()[self._string_start:pos + 1])
+            frame['expect_key'] = False
+
+    def _pop(self, pos: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        frame = self._stack.pop()
+        depth = len(self._stack)
+        is_layout = depth == 1 and frame['type'] == 'obj' and frame['key'] == 'layout'
+        is_chart = depth == 2 and frame['type'] == 'obj' and frame['key'] == 'charts' \
+            and self._stack[-1]['type'] == 'arr'
+        if not (is_layout or is_chart):
+            return None
+        try:
+            value = json.loads(self._text()[frame['start']:pos + 1])
+        except json.JSONDecodeError:
+            return None
+        return ('layout' if is_layout else 'chart', value)
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Return the complete spec, or None if the top-level object never closed"""
+        if not self.done:
+            return None
+        try:
+            return json.loads(self._text()[self._top_start:self._top_end + 1])
+        except json.JSONDecodeError:
+            return None
@@ -1,12 +1,81 @@
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+import pandas as pd
 import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 import re
+import copy
+import time
+import threading
+from .prompt_builder import PromptBuilder
+from .incremental_json import IncrementalSpecParser
+from .async_llm import AsyncLLMClient, run_sync, default_chart_title
+
+# Returned when the model is unavailable or its output cannot be parsed
+DEFAULT_DASHBOARD_SPEC = {
+    "dashboard_title": "Sample Dashboard",
+    "data_sources": [
+        {"type": "csv", "path": "data.csv"}
+    ],
+    "charts": [
+        {
+            "title": "Sales by Industry",
+            "type": "bar",
+            "x_field": "Industry",
+            "y_field": "Sales",
+            "color_field": "Region",
+            "interactive": True
+        },
+        {
+            "title": "Sales by Region",
+            "type": "pie",
+            "labels_field": "Region",
+            "values_field": "Sales"
+        },
+        {
+            "title": "Sales Over Time",
+            "type": "time_series",
+            "time_field": "Date",
+            "value_field": "Sales",
+            "group_field": "Product"
+        },
+        {
+            "title": "Product Statistics",
+            "type": "statistics",
+            "value_field": "Sales",
+            "group_field": "Product"
+        },
+        {
+            "title": "Total Sales",
+            "type": "gauge",
+            "value_field": "Sales"
+        },
+        {
+            "title": "Top Products",
+            "type": "table",
+            "columns": ["Product", "Sales", "Region"]
+        }
+    ],
+    "layout": {
+        "rows": 3,
+        "columns": 2,
+        "chart_positions": [
+            {"chart": "Sales by Industry", "row": 1, "column": 1},
+            {"chart": "Sales by Region", "row": 1, "column": 2},
+            {"chart": "Sales Over Time", "row": 2, "column": 1},
+            {"chart": "Product Statistics", "row": 2, "column": 2},
+            {"chart": "Total Sales", "row": 3, "column": 1},
+            {"chart": "Top Products", "row": 3, "column": 2}
+        ]
+    },
+    "filters": ["Industry", "Region", "Product"],
+    "notes": "Sample dashboard with all chart types"
+}
 
 class LLMHandler:
     def __init__(self):
+        start = time.perf_counter()
         load_dotenv()
         api_key = os.getenv('GOOGLE_API_KEY')
         if not api_key:
@@ -23,124 +92,40 @@ class LLMHandler:
                 # Fallback to a simple response if model loading fails
                 self.model = None
 
-    def parse_dashboard_spec(self, spec_text: str) -> Dict[str, Any]:
+        # Seconds spent building this handler, shared by every session
+        self.init_seconds = time.perf_counter() - start
+        self._async = None
+
+    @staticmethod
+    def _usage(prompt: str, response_text: str, metadata, seconds: float) -> Dict[str, Any]:
+        """Token counts and duration of one spec request, estimating tokens if the API reports none.
+
+        The handler is shared across sessions, so usage is returned with each
+        request rather than stored on the handler.
+        """
+        if metadata is not None and getattr(metadata, 'prompt_token_count', None):
+            usage = {
+                'prompt_tokens': metadata.prompt_token_count,
+                'response_tokens': metadata.candidates_token_count,
+                'estimated': False
+            }
+        else:
+            usage = {
+                'prompt_tokens': PromptBuilder.estimate_tokens(prompt),
+                'response_tokens': PromptBuilder.estimate_tokens(response_text),
+                'estimated': True
+            }
+        usage['seconds'] = seconds
+        return usage
+
+    def parse_dashboard_spec(self, spec_text: str, data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Parse natural language dashboard specification into structured format"""
         if self.model is None:
             # Fallback to a simple response if model is not available
-            return {
-                "dashboard_title": "Sample Dashboard",
-                "data_sources": [
-                    {"type": "csv", "path": "data.csv"}
-                ],
-                "charts": [
-                    {
-                        "title": "Sales by Industry",
-                        "type": "bar",
-                        "x_field": "Industry",
-                        "y_field": "Sales",
-                        "color_field": "Region",
-                        "interactive": True
-                    },
-                    {
-                        "title": "Sales by Region",
-                        "type": "pie",
-                        "labels_field": "Region",
-                        "values_field": "Sales"
-                    },
-                    {
-                        "title": "Sales Over Time",
-                        "type": "time_series",
-                        "time_field": "Date",
-                        "value_field": "Sales",
-                        "group_field": "Product"
-                    },
-                    {
-                        "title": "Product Statistics",
-                        "type": "statistics",
-                        "value_field": "Sales",
-                        "group_field": "Product"
-                    },
-                    {
-                        "title": "Total Sales",
-                        "type": "gauge",
-                        "value_field": "Sales"
-                    },
-                    {
-                        "title": "Top Products",
-                        "type": "table",
-                        "columns": ["Product", "Sales", "Region"]
-                    }
-                ],
-                "layout": {
-                    "rows": 3,
-                    "columns": 2,
-                    "chart_positions": [
-                        {"chart": "Sales by Industry", "row": 1, "column": 1},
-                        {"chart": "Sales by Region", "row": 1, "column": 2},
-                        {"chart": "Sales Over Time", "row": 2, "column": 1},
-                        {"chart": "Product Statistics", "row": 2, "column": 2},
-                        {"chart": "Total Sales", "row": 3, "column": 1},
-                        {"chart": "Top Products", "row": 3, "column": 2}
-                    ]
-                },
-                "filters": ["Industry", "Region", "Product"],
-                "notes": "Sample dashboard with all chart types"
-            }
+            return copy.deepcopy(DEFAULT_DASHBOARD_SPEC)
 
         try:
-            prompt = f"""
-            You are a professional dashboard specification analyzer.
-            Parse the following dashboard specification into a structured JSON format:
-
-            {spec_text}
-
-            Return ONLY the JSON object with the following structure:
-            {{
-                "dashboard_title": "string",
-                "data_sources": [
-                    {{ "type": "string", "path": "string" }}
-                ],
-                "charts": [
-                    {{
-                        "title": "string",
-                        "type": "string",
-                        "x_field": "string",
-                        "y_field": "string",
-                        "color_field": "string",
-                        "interactive": boolean
-                    }}
-                ],
-                "layout": {{
-                    "rows": number,
-                    "columns": number,
-                    "chart_positions": [
-                        {{"chart": "string", "row": number, "column": number}}
-                    ]
-                }},
-                "filters": ["string"],
-                "notes": "string"
-            }}
-
-            The chart types can be one of the following:
-            - "bar": Requires x_field and y_field
-            - "pie": Requires labels_field and values_field
-            - "line": Requires x_field and y_field
-            - "scatter": Requires x_field and y_field
-            - "time_series": Requires time_field and value_field
-            - "statistics": Requires value_field (and optionally group_field)
-            - "gauge": Requires value_field
-            - "table": No required fields, but can have columns field
-
-            Examples:
-            - Bar chart: {{"title": "Sales by Product", "type": "bar", "x_field": "Product", "y_field": "Sales"}}
-            - Pie chart: {{"title": "Sales by Region", "type": "pie", "labels_field": "Region", "values_field": "Sales"}}
-            - Time series: {{"title": "Sales Over Time", "type": "time_series", "time_field": "Date", "value_field": "Sales", "group_field": "Product"}}
-            - Statistics: {{"title": "Product Statistics", "type": "statistics", "value_field": "Sales", "group_field": "Product"}}
-            - Gauge: {{"title": "Total Sales", "type": "gauge", "value_field": "Sales"}}
-            - Table: {{"title": "Top Products", "type": "table", "columns": ["Product", "Sales", "Region"]}}
-
-            IMPORTANT: Make sure to include at least one example of each chart type in your response.
-            """
+            prompt = PromptBuilder.build_spec_prompt(spec_text, data)
 
             response = self.model.generate_content(prompt)
             response_text = response.text
@@ -156,127 +141,60 @@ class LLMHandler:
                     print(f"Error parsing JSON: {json_str}")
             
             # If we couldn't extract valid JSON, return a default specification
-            return {
-                "dashboard_title": "Sample Dashboard",
-                "data_sources": [
-                    {"type": "csv", "path": "data.csv"}
-                ],
-                "charts": [
-                    {
-                        "title": "Sales by Industry",
-                        "type": "bar",
-                        "x_field": "Industry",
-                        "y_field": "Sales",
-                        "color_field": "Region",
-                        "interactive": True
-                    },
-                    {
-                        "title": "Sales by Region",
-                        "type": "pie",
-                        "labels_field": "Region",
-                        "values_field": "Sales"
-                    },
-                    {
-                        "title": "Sales Over Time",
-                        "type": "time_series",
-                        "time_field": "Date",
-                        "value_field": "Sales",
-                        "group_field": "Product"
-                    },
-                    {
-                        "title": "Product Statistics",
-                        "type": "statistics",
-                        "value_field": "Sales",
-                        "group_field": "Product"
-                    },
-                    {
-                        "title": "Total Sales",
-                        "type": "gauge",
-                        "value_field": "Sales"
-                    },
-                    {
-                        "title": "Top Products",
-                        "type": "table",
-                        "columns": ["Product", "Sales", "Region"]
-                    }
-                ],
-                "layout": {
-                    "rows": 3,
-                    "columns": 2,
-                    "chart_positions": [
-                        {"chart": "Sales by Industry", "row": 1, "column": 1},
-                        {"chart": "Sales by Region", "row": 1, "column": 2},
-                        {"chart": "Sales Over Time", "row": 2, "column": 1},
-                        {"chart": "Product Statistics", "row": 2, "column": 2},
-                        {"chart": "Total Sales", "row": 3, "column": 1},
-                        {"chart": "Top Products", "row": 3, "column": 2}
-                    ]
-                },
-                "filters": ["Industry", "Region", "Product"],
-                "notes": "Sample dashboard with all chart types"
-            }
+            return copy.deepcopy(DEFAULT_DASHBOARD_SPEC)
         except Exception as e:
             print(f"Error in LLM parsing: {str(e)}")
             # Return a simple response if parsing fails
-            return {
-                "dashboard_title": "Sample Dashboard",
-                "data_sources": [
-                    {"type": "csv", "path": "data.csv"}
-                ],
-                "charts": [
-                    {
-                        "title": "Sales by Industry",
-                        "type": "bar",
-                        "x_field": "Industry",
-                        "y_field": "Sales",
-                        "color_field": "Region",
-                        "interactive": True
-                    },
-                    {
-                        "title": "Sales by Region",
-                        "type": "pie",
-                        "labels_field": "Region",
-                        "values_field": "Sales"
-                    },
-                    {
-                        "title": "Sales Over Time",
-                        "type": "time_series",
-                        "time_field": "Date",
-                        "value_field": "Sales",
-                        "group_field": "Product"
-                    },
-                    {
-                        "title": "Product Statistics",
-                        "type": "statistics",
-                        "value_field": "Sales",
-                        "group_field": "Product"
-                    },
-                    {
-                        "title": "Total Sales",
-                        "type": "gauge",
-                        "value_field": "Sales"
-                    },
-                    {
-                        "title": "Top Products",
-                        "type": "table",
-                        "columns": ["Product", "Sales", "Region"]
-                    }
-                ],
-                "layout": {
-                    "rows": 3,
-                    "columns": 2,
-                    "chart_positions": [
-                        {"chart": "Sales by Industry", "row": 1, "column": 1},
-                        {"chart": "Sales by Region", "row": 1, "column": 2},
-                        {"chart": "Sales Over Time", "row": 2, "column": 1},
-                        {"chart": "Product Statistics", "row": 2, "column": 2},
-                        {"chart": "Total Sales", "row": 3, "column": 1},
-                        {"chart": "Top Products", "row": 3, "column": 2}
-                    ]
-                },
-                "filters": ["Industry", "Region", "Product"],
-                "notes": "Sample dashboard with all chart types"
-            }
+            return copy.deepcopy(DEFAULT_DASHBOARD_SPEC)
+
+    def stream_dashboard_spec(
+        self,
+        spec_text: str,
+        data: Optional[pd.DataFrame] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream ('layout', ...) and ('chart', ...) events as the model writes the spec.
+
+        Once the response has been read, a ('usage', dict) event reports the
+        request's token counts and seconds. The last event is always
+        ('spec', full_spec). If the stream fails or
+        its JSON never completes, an ('error', message) event comes first and
+        the spec is None, so the caller can decide what to do with the charts
+        already streamed.
+        """
+        if self.model is None:
+            spec = copy.deepcopy(DEFAULT_DASHBOARD_SPEC)
+            yield 'layout', spec['layout']
+            for chart in spec['charts']:
+                yield 'chart', chart
+            yield 'spec', spec
+            return
+
+        parser = IncrementalSpecParser()
+        spec = None
+        error = None
+        try:
+            prompt = PromptBuilder.build_spec_prompt(spec_text, data)
+            start = time.perf_counter()
+            response_text = []
+            metadata = None
+            for chunk in self.model.generate_content(prompt, stream=True):
+                response_text.append(chunk.text)
+                # The final chunk carries the totals for the whole response
+                metadata = getattr(chunk, 'usage_metadata', None) or metadata
+                for event in parser.feed(chunk.text):
+                    yield event
+            yield 'usage', LLMHandler._usage(
+                prompt, ''.join(response_text), metadata, time.perf_counter() - start
+            )
+            spec = parser.result()
+            if spec is None:
+                error = "The model's response ended before the specification was complete"
+        except Exception as e:
+            print(f"Error in LLM streaming: {str(e)}")
+            error = str(e)
+        if error is not None:
+            yield 'error', error
+        yield 'spec', spec
 
     def suggest_chart_type(self, data_description: str, visualization_goal: str) -> str:
         """Suggest the most appropriate chart type based on data and goal"""
@@ -284,15 +202,7 @@ class LLMHandler:
             return "bar"  # Default to bar chart
 
         try:
-            prompt = f"""
-            Based on the following data description and visualization goal, suggest the most appropriate chart type.
-            Choose from: bar, pie, line, scatter, time_series, statistics, gauge, or table.
-
-            Data description: {data_description}
-            Visualization goal: {visualization_goal}
-
-            Return ONLY the chart type as a string.
-            """
+            prompt = PromptBuilder.build_chart_type_prompt(data_description, visualization_goal)
 
             response = self.model.generate_content(prompt)
             return response.text.strip().lower()
@@ -303,17 +213,53 @@ class LLMHandler:
     def generate_chart_title(self, chart_type: str, fields: list) -> str:
         """Generate a descriptive title for a chart based on its type and fields"""
         if self.model is None:
-            return f"{chart_type.capitalize()} Chart of {', '.join(fields)}"
+            return default_chart_title(chart_type, fields)
 
         try:
-            prompt = f"""
-            Generate a concise, descriptive title for a {chart_type} chart that uses the following fields: {', '.join(fields)}.
-
-            Return ONLY the title as a string.
-            """
+            prompt = PromptBuilder.build_chart_title_prompt(chart_type, fields)
 
             response = self.model.generate_content(prompt)
             return response.text.strip()
         except Exception as e:
             print(f"Error in title generation: {str(e)}")
-            return f"{chart_type.capitalize()} Chart of {', '.join(fields)}" 
\ No newline at end of file
+            return default_chart_title(chart_type, fields)
+
+    def _async_client(self) -> AsyncLLMClient:
+        if self._async is None:
+            self._async = AsyncLLMClient(self.model)
+        return self._async
+
+    def suggest_chart_types(self, requests: List[Tuple[str, str]]) -> List[str]:
+        """Suggest chart types for several (data description, goal) pairs concurrently"""
+        if self.model is None:
+            return ["bar"] * len(requests)
+        return run_sync(self._async_client().suggest_chart_types(requests))
+
+    def generate_chart_titles(self, charts: List[Tuple[str, list]]) -> List[str]:
+        """Generate titles for several (chart type, fields) pairs in batched, concurrent calls"""
+        if self.model is None:
+            return [default_chart_title(chart_type, fields) for chart_type, fields in charts]
+        return run_sync(self._async_client().generate_chart_titles(charts))
+
+
+_shared_handler = None
+_shared_handler_lock = threading.Lock()
+
+
+def get_llm_handler() -> LLMHandler:
+    """Return the process-wide LLMHandler, building it on first use.
+
+    Streamlit sessions run as threads of one process, so they all share this
+    handler instead of reconfiguring the client on every button press.
+    """
+    global _shared_handler
+    if _shared_handler is None:
+        with _shared_handler_lock:
+            if _shared_handler is None:
+                _shared_handler = LLMHandler()
+    return _shared_handler
+
+
+def llm_init_seconds() -> Optional[float]:
+    """Seconds the shared handler took to build, or None if it has not been built yet"""
+    return _shared_handler.init_seconds if _shared_handler is not None else None
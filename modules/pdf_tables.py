@@ -0,0 +1,209 @@
+import os
+import re
+import pandas as pd
+import PyPDF2
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Union, Optional
+
+# Cells are separated by tabs or runs of two or more spaces
+CELL_SPLIT = re.compile(r'\t+|\s{2,}')
+NUMBER = re.compile(r'^\(?[-+]?[$€£]?\(?[\d,]*\.?\d+\)?%?\)?$')
+
+# PDF bytes shared by every task in a worker process, set by the pool initializer
+_worker_pdf_bytes = None
+
+Page = Tuple[str, List[List[List[str]]]]
+
+
+def _init_worker(pdf_bytes: bytes) -> None:
+    global _worker_pdf_bytes
+    _worker_pdf_bytes = pdf_bytes
+
+
+def _extract_page_range(start: int, stop: int, pdf_bytes: Optional[bytes] = None) -> List[Tuple[int, Page]]:
+    """Extract the text and tables of pages [start, stop).
+
+    Worker processes read the PDF set by the pool initializer; the serial
+    path passes ``pdf_bytes`` directly so no module state outlives the call.
+    """
+    reader = PyPDF2.PdfReader(BytesIO(pdf_bytes if pdf_bytes is not None else _worker_pdf_bytes))
+    pages = []
+    for i in range(start, stop):
+        text = reader.pages[i].extract_text() or ""
+        pages.append((i, (text, PDFTableExtractor.detect_tables(text))))
+    return pages
+
+
+class PDFTableExtractor:
+    # Minimum number of consecutive rows with the same column count to count as a table
+    MIN_TABLE_ROWS = 3
+    MIN_COLUMNS = 2
+    PAGES_PER_TASK = 8
+    # Below this many pages the process pool costs more than it saves
+    PARALLEL_MIN_PAGES = 16
+    # Share of non-empty cells that must parse as numbers for a column to become numeric
+    NUMERIC_MIN_SHARE = 0.9
+
+    @staticmethod
+    def read_bytes(source: Union[str, BytesIO]) -> bytes:
+        """Return the raw bytes of a path, Streamlit upload or buffer"""
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return f.read()
+        if hasattr(source, 'getvalue'):
+            return source.getvalue()
+        source.seek(0)
+        return source.read()
+
+    @staticmethod
+    def extract_pages(pdf_bytes: bytes, max_workers: Optional[int] = None) -> List[Page]:
+        """Extract each page's text and detected tables, fanning page ranges out to a process pool for large PDFs"""
+        n_pages = len(PyPDF2.PdfReader(BytesIO(pdf_bytes)).pages)
+        ranges = [
+            (start, min(start + PDFTableExtractor.PAGES_PER_TASK, n_pages))
+            for start in range(0, n_pages, PDFTableExtractor.PAGES_PER_TASK)
+        ]
+
+        if n_pages >= PDFTableExtractor.PARALLEL_MIN_PAGES:
+            max_workers = max_workers or min(len(ranges), os.cpu_count() or 1)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_worker,
+                    initargs=(pdf_bytes,)
+                ) as pool:
+                    futures = [pool.submit(_extract_page_range, start, stop) for start, stop in ranges]
+                    pages = [page for future in futures for page in future.result()]
+                return [page for _, page in sorted(pages)]
+            except Exception as e:
+                print(f"Parallel PDF extraction failed, falling back to serial: {str(e)}")
+
+        return [page for start, stop in ranges for _, page in _extract_page_range(start, stop, pdf_bytes)]
+
+    @staticmethod
+    def split_line(line: str) -> List[str]:
+        """Split a text line into table cells"""
+        cells = [c.strip() for c in CELL_SPLIT.split(line.strip()) if c.strip()]
+        if len(cells) >= PDFTableExtractor.MIN_COLUMNS:
+            return cells
+
+        # Text extraction often collapses column gaps to a single space, so fall
+        # back to "label followed by numbers", the usual shape of report rows
+        tokens = line.split()
+        n_numeric = 0
+        for token in reversed(tokens):
+            if not NUMBER.match(token):
+                break
+            n_numeric += 1
+        if n_numeric == 0:
+            return tokens if len(tokens) >= PDFTableExtractor.MIN_COLUMNS else cells
+        label = tokens[:len(tokens) - n_numeric]
+        numbers = tokens[len(tokens) - n_numeric:]
+        return ([" ".join(label)] if label else []) + numbers
+
+    @staticmethod
+    def detect_tables(text: str) -> List[List[List[str]]]:
+        """Find runs of consecutive lines that share a column count"""
+        tables = []
+        run = []
+        previous = []
+        for line in text.splitlines():
+            cells = PDFTableExtractor.split_line(line) if line.strip() else []
+            is_row = len(cells) >= PDFTableExtractor.MIN_COLUMNS
+            # Plain words without column gaps are as likely to be prose as a
+            # table row, so they are only trusted as the first (header) row
+            words_only = is_row and not PDFTableExtractor._has_column_gaps(line) \
+                and PDFTableExtractor._is_header(cells)
+            if is_row and (not run or (len(cells) == len(run[0]) and not words_only)):
+                if not run and not words_only:
+                    run = PDFTableExtractor._header_from(previous, len(cells))
+                run.append(cells)
+            else:
+                if len(run) >= PDFTableExtractor.MIN_TABLE_ROWS:
+                    tables.append(run)
+                run = []
+                if is_row:
+                    header = [] if words_only else PDFTableExtractor._header_from(previous, len(cells))
+                    run = header + [cells]
+            previous = line.split()
+        if len(run) >= PDFTableExtractor.MIN_TABLE_ROWS:
+            tables.append(run)
+        return tables
+
+    @staticmethod
+    def _header_from(tokens: List[str], n_columns: int) -> List[List[str]]:
+        """Build a header row from the line above a table whose width did not match.
+
+        Extra leading words are merged into the first header cell, so
+        "Product Name Q1 Q2" becomes ["Product Name", "Q1", "Q2"].
+        """
+        if len(tokens) <= n_columns or not PDFTableExtractor._is_header(tokens):
+            return []
+        split = len(tokens) - n_columns + 1
+        return [[" ".join(tokens[:split])] + tokens[split:]]
+
+    @staticmethod
+    def _has_column_gaps(line: str) -> bool:
+        return len([c for c in CELL_SPLIT.split(line.strip()) if c.strip()]) >= PDFTableExtractor.MIN_COLUMNS
+
+    @staticmethod
+    def _is_header(row: List[str]) -> bool:
+        return not any(NUMBER.match(cell) for cell in row)
+
+    @staticmethod
+    def stitch_tables(tables: List[List[List[str]]]) -> List[pd.DataFrame]:
+        """Join table fragments that share a header (e.g. one table split over pages)"""
+        groups = {}
+        for rows in tables:
+            if PDFTableExtractor._is_header(rows[0]):
+                header, body = tuple(rows[0]), rows[1:]
+            else:
+                header = tuple(f"column_{i + 1}" for i in range(len(rows[0])))
+                body = rows
+            # Continuation pages without a repeated header attach to the last
+            # table with the same width
+            if header[0].startswith('column_'):
+                for existing in reversed(list(groups)):
+                    if len(existing) == len(header):
+                        header = existing
+                        break
+            groups.setdefault(header, []).extend(row for row in body if tuple(row) != header)
+
+        frames = []
+        for header, body in groups.items():
+            if body:
+                frames.append(PDFTableExtractor.type_columns(pd.DataFrame(body, columns=list(header))))
+        return frames
+
+    @staticmethod
+    def type_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Convert columns of formatted numbers (1,200 / $5 / (3) / 12%) to numeric dtypes"""
+        for col in df.columns:
+            values = df[col].astype(str).str.strip()
+            negative = values.str.match(r'^\(.*\)$')
+            cleaned = values.str.replace(r'[,$€£%()\s]', '', regex=True)
+            numbers = pd.to_numeric(cleaned, errors='coerce')
+            non_empty = cleaned != ''
+            if non_empty.any() and numbers[non_empty].notna().mean() >= PDFTableExtractor.NUMERIC_MIN_SHARE:
+                df[col] = numbers.where(~negative, -numbers)
+        return df
+
+    @staticmethod
+    def extract(source: Union[str, BytesIO], max_workers: Optional[int] = None) -> pd.DataFrame:
+        """Extract the largest table in a PDF as a typed DataFrame.
+
+        Falls back to a single ``text`` column when no table is detected.
+        """
+        pdf_bytes = PDFTableExtractor.read_bytes(source)
+        pages = PDFTableExtractor.extract_pages(pdf_bytes, max_workers)
+
+        tables = [table for _, page_tables in pages for table in page_tables]
+        frames = PDFTableExtractor.stitch_tables(tables)
+        if not frames:
+            return pd.DataFrame({'text': ["\n".join(text for text, _ in pages)]})
+
+        frames.sort(key=len, reverse=True)
+        df = frames[0].reset_index(drop=True)
+        df.attrs['pdf_tables'] = len(frames)
+        return df
@@ -0,0 +1,142 @@
+import warnings
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any
+from .dtype_optimizer import DtypeOptimizer
+from .figure_cache import get_figure_cache
+
+# Profiles are computed off the Streamlit script thread where possible
+_profile_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='profile')
+
+
+class HyperLogLog:
+    """Approximate distinct counter over 64-bit hashes, about 1% error with the default precision"""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add a batch of uint64 hashes"""
+        p = self.precision
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Rank is the position of the leftmost 1-bit in the remaining 64 - p bits
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, 64 - p + 1, 64 - p - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class DatasetProfiler:
+    """Per-column statistics and column roles for a dataset, computed in one sweep.
+
+    Each column gets its dtype, kind (number, date or category), null count,
+    distinct count, and min/max where they apply. Distinct counts are exact up
+    to EXACT_DISTINCT_MAX_ROWS rows and estimated with HyperLogLog above that.
+    """
+
+    EXACT_DISTINCT_MAX_ROWS = 1_000_000
+    # Distinct values listed for low-cardinality columns
+    MAX_TOP_VALUES = 5
+
+    @staticmethod
+    def _looks_like_dates(series: pd.Series) -> bool:
+        """Check whether a sample of a text column parses as dates"""
+        sample = series.dropna().iloc[:DtypeOptimizer.DATE_SAMPLE_SIZE].astype(str)
+        if sample.empty or sample.str.fullmatch(r'[-+]?\d+(\.\d+)?').all():
+            return False
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            parsed = pd.to_datetime(sample, errors='coerce')
+        return parsed.notna().mean() >= DtypeOptimizer.DATE_MIN_SUCCESS
+
+    @staticmethod
+    def column_kind(series: pd.Series) -> str:
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return 'date'
+        if pd.api.types.is_bool_dtype(series):
+            return 'category'
+        if pd.api.types.is_numeric_dtype(series):
+            return 'number'
+        if DatasetProfiler._looks_like_dates(series):
+            return 'date'
+        return 'category'
+
+    @staticmethod
+    def distinct_count(series: pd.Series) -> Dict[str, Any]:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Codes are already a compact index of the values
+            return {'n_unique': int(len(np.unique(series.cat.codes[series.cat.codes >= 0]))), 'approximate': False}
+        if len(series) <= DatasetProfiler.EXACT_DISTINCT_MAX_ROWS:
+            return {'n_unique': int(series.nunique(dropna=True)), 'approximate': False}
+        sketch = HyperLogLog()
+        sketch.add(pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy())
+        return {'n_unique': sketch.count(), 'approximate': True}
+
+    @staticmethod
+    def profile_column(series: pd.Series) -> Dict[str, Any]:
+        kind = DatasetProfiler.column_kind(series)
+        profile = {
+            'name': str(series.name),
+            'dtype': str(series.dtype),
+            'kind': kind,
+            'n_nulls': int(series.isna().sum())
+        }
+        profile.update(DatasetProfiler.distinct_count(series))
+        orderable = pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+        if orderable and not pd.api.types.is_bool_dtype(series):
+            profile['min'] = series.min()
+            profile['max'] = series.max()
+        if kind == 'category' and profile['n_unique'] <= DatasetProfiler.MAX_TOP_VALUES:
+            profile['values'] = [str(v) for v in series.dropna().unique()[:DatasetProfiler.MAX_TOP_VALUES]]
+        return profile
+
+    @staticmethod
+    def profile(data: pd.DataFrame) -> Dict[str, Any]:
+        """Profile every column and derive the column roles used to pick chart fields"""
+        columns = {col: DatasetProfiler.profile_column(data[col]) for col in data.columns}
+        roles = {
+            'numeric': [col for col, p in columns.items() if p['kind'] == 'number'],
+            'categorical': [col for col, p in columns.items()
+                            if p['kind'] == 'category' and not pd.api.types.is_bool_dtype(data[col])],
+            'date': [col for col, p in columns.items() if p['kind'] == 'date']
+        }
+        return {'n_rows': len(data), 'columns': columns, 'roles': roles}
+
+
+_profiles: 'OrderedDict[str, Future]' = OrderedDict()
+_profiles_lock = threading.Lock()
+MAX_PROFILES = 32
+
+
+def start_profiling(data: pd.DataFrame) -> Future:
+    """Start profiling a dataset in the background, or return the profile already under way"""
+    fingerprint = get_figure_cache().dataset_fingerprint(data)
+    with _profiles_lock:
+        future = _profiles.get(fingerprint)
+        if future is None:
+            future = _profile_executor.submit(DatasetProfiler.profile, data)
+            _profiles[fingerprint] = future
+            while len(_profiles) > MAX_PROFILES:
+                _profiles.popitem(last=False)
+        _profiles.move_to_end(fingerprint)
+        return future
+
+
+def get_dataset_profile(data: pd.DataFrame) -> Dict[str, Any]:
+    """Return the profile for this dataset's content, computing it once per fingerprint"""
+    return start_profiling(data).result()
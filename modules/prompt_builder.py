@@ -0,0 +1,132 @@
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from .profiler import get_dataset_profile
+
+# Field requirements per chart type, as described to the model
+CHART_TYPE_FIELDS = {
+    'bar': 'x_field (category), y_field (number), optional color_field, aggregate',
+    'pie': 'labels_field (category), values_field (number), optional aggregate',
+    'line': 'x_field, y_field (number), optional color_field',
+    'scatter': 'x_field (number), y_field (number), optional color_field, size_field',
+    'time_series': 'time_field (date), value_field (number), optional group_field',
+    'statistics': 'value_field (number), optional group_field',
+    'gauge': 'value_field (number)',
+    'table': 'optional columns (list)'
+}
+
+
+class PromptBuilder:
+    # Distinct values shown for low-cardinality text columns
+    MAX_SAMPLE_VALUES = 5
+    # Rough characters-per-token ratio used when the model reports no usage
+    CHARS_PER_TOKEN = 4
+
+    @staticmethod
+    def summarize_schema(data: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Describe each column by kind, dtype and cardinality, from the shared dataset profile"""
+        summary = []
+        for profile in get_dataset_profile(data)['columns'].values():
+            entry = {key: profile[key] for key in ('name', 'kind', 'dtype', 'n_unique')}
+            if profile['kind'] == 'category' and 'values' in profile:
+                entry['values'] = profile['values'][:PromptBuilder.MAX_SAMPLE_VALUES]
+            summary.append(entry)
+        return summary
+
+    @staticmethod
+    def schema_text(summary: List[Dict[str, Any]]) -> str:
+        """Render a schema summary as one short line per column"""
+        lines = []
+        for entry in summary:
+            line = f"- {entry['name']}: {entry['kind']}, {entry['n_unique']} distinct"
+            if 'values' in entry:
+                line += f" ({', '.join(entry['values'])})"
+            lines.append(line)
+        return "\n".join(lines)
+
+    @staticmethod
+    def relevant_chart_types(summary: Optional[List[Dict[str, Any]]]) -> List[str]:
+        """Return the chart types the dataset's columns can actually support"""
+        if summary is None:
+            return list(CHART_TYPE_FIELDS)
+        kinds = [entry['kind'] for entry in summary]
+        n_numbers = kinds.count('number')
+        has_category = 'category' in kinds
+        has_date = 'date' in kinds or any(
+            'date' in entry['name'].lower() or 'time' in entry['name'].lower() for entry in summary
+        )
+
+        types = []
+        if n_numbers and has_category:
+            types += ['bar', 'pie']
+        if n_numbers and (has_category or has_date):
+            types.append('line')
+        if n_numbers >= 2:
+            types.append('scatter')
+        if n_numbers and has_date:
+            types.append('time_series')
+        if n_numbers:
+            types += ['statistics', 'gauge']
+        types.append('table')
+        return types
+
+    @staticmethod
+    def build_spec_prompt(spec_text: str, data: Optional[pd.DataFrame] = None) -> str:
+        """Build a compact spec-parsing prompt grounded in the dataset's real columns"""
+        summary = PromptBuilder.summarize_schema(data) if data is not None else None
+        chart_types = PromptBuilder.relevant_chart_types(summary)
+
+        lines = [
+            "Convert the dashboard request into JSON. Reply with the JSON object only.",
+            "",
+            f"Request: {spec_text.strip()}",
+            ""
+        ]
+        if summary is not None:
+            lines += [
+                "Columns (use only these names):",
+                PromptBuilder.schema_text(summary),
+                ""
+            ]
+        lines += [
+            "Chart types and fields:",
+            *[f"- {t}: {CHART_TYPE_FIELDS[t]}" for t in chart_types],
+            "",
+            # Layout comes before charts so a streamed reply can be laid out early
+            'Shape: {"dashboard_title": str, '
+            '"layout": {"rows": int, "columns": int, "chart_positions": [{"chart": title, "row": int, "column": int}]}, '
+            '"charts": [{"title": str, "type": str, ...fields}], "filters": [column]}',
+            "aggregate is one of sum (default), mean, median, min, max, count.",
+            "Include only the charts the request asks for."
+        ]
+        return "\n".join(lines)
+
+    @staticmethod
+    def build_chart_type_prompt(data_description: str, visualization_goal: str) -> str:
+        return (
+            "Based on the following data description and visualization goal, suggest the most appropriate chart type.\n"
+            "Choose from: bar, pie, line, scatter, time_series, statistics, gauge, or table.\n\n"
+            f"Data description: {data_description}\n"
+            f"Visualization goal: {visualization_goal}\n\n"
+            "Return ONLY the chart type as a string."
+        )
+
+    @staticmethod
+    def build_chart_title_prompt(chart_type: str, fields: List[str]) -> str:
+        return (
+            f"Generate a concise, descriptive title for a {chart_type} chart that uses the following fields: "
+            f"{', '.join(fields)}.\n\n"
+            "Return ONLY the title as a string."
+        )
+
+    @staticmethod
+    def build_batch_title_prompt(charts: List[tuple]) -> str:
+        """Ask for several chart titles in one request, answered as a JSON array"""
+        lines = ["Generate a concise, descriptive title for each chart below.", ""]
+        for i, (chart_type, fields) in enumerate(charts, start=1):
+            lines.append(f"{i}. {chart_type} chart of {', '.join(fields)}")
+        lines += ["", f"Return ONLY a JSON array of {len(charts)} title strings, in the same order."]
+        return "\n".join(lines)
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return max(1, len(text) // PromptBuilder.CHARS_PER_TOKEN) if text else 0
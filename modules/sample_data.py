@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+
+PRODUCTS = ['Product A', 'Product B', 'Product C', 'Product D', 'Product E']
+REGIONS = ['North', 'South', 'East', 'West']
+INDUSTRIES = ['Technology', 'Healthcare', 'Finance', 'Retail', 'Manufacturing']
+
+DEFAULT_ROWS = 10_000
+DEFAULT_SEED = 42
+MIN_DAYS = 100
+MAX_DAYS = 3650
+# Rows per day once the dataset outgrows MIN_DAYS days, until it spans MAX_DAYS
+ROWS_PER_DAY = 1_000
+# Only datasets up to this size (about 18 MB each) are memoized process-wide;
+# larger ones are kept only in the session state of the session that made them
+MEMOIZE_MAX_ROWS = 1_000_000
+
+
+def _build(n_rows: int, seed: int, end_date: pd.Timestamp) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_days = min(MAX_DAYS, max(MIN_DAYS, n_rows // ROWS_PER_DAY))
+    # Rows are spread evenly over the days, newest first, so no sort is needed
+    day_offsets = (np.arange(n_rows, dtype=np.int64) * n_days) // max(n_rows, 1)
+    dates = np.datetime64(end_date, 'ns') - day_offsets.astype('timedelta64[D]')
+
+    sales = rng.integers(100, 1000, size=n_rows, dtype=np.int16)
+    profit = sales * rng.uniform(0.1, 0.3, size=n_rows).astype(np.float32)
+    return pd.DataFrame({
+        'Date': dates,
+        'Product': pd.Categorical.from_codes(rng.integers(0, len(PRODUCTS), n_rows, dtype=np.int8), PRODUCTS),
+        'Region': pd.Categorical.from_codes(rng.integers(0, len(REGIONS), n_rows, dtype=np.int8), REGIONS),
+        'Industry': pd.Categorical.from_codes(rng.integers(0, len(INDUSTRIES), n_rows, dtype=np.int8), INDUSTRIES),
+        'Sales': sales,
+        'Profit': profit,
+        'Units': rng.integers(10, 100, size=n_rows, dtype=np.int8)
+    })
+
+
+@lru_cache(maxsize=4)
+def _build_memoized(n_rows: int, seed: int, end_date: pd.Timestamp) -> pd.DataFrame:
+    return _build(n_rows, seed, end_date)
+
+
+def generate_sample_data(n_rows: int = DEFAULT_ROWS, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Generate a sales dataset of n_rows rows, built column-wise with NumPy.
+
+    Results of up to MEMOIZE_MAX_ROWS rows are memoized per (n_rows, seed)
+    for the current day, so reruns reuse the same frame; callers must not
+    modify it in place. Dtypes are already compact (categoricals,
+    int8/int16, float32), so 100M rows take about 1.8 GB.
+    """
+    n_rows, seed = int(n_rows), int(seed)
+    build = _build_memoized if n_rows <= MEMOIZE_MAX_ROWS else _build
+    return build(n_rows, seed, pd.Timestamp.today().normalize())
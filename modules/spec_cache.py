@@ -0,0 +1,101 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+from contextlib import closing
+import pandas as pd
+from typing import Dict, Any, Optional
+
+
+class SpecCache:
+    """Persistent SQLite cache of parsed dashboard specs.
+
+    Specs are keyed on the normalized specification text plus the column
+    signature of the dataset, so the same prompt against a differently shaped
+    dataset is parsed again. The database is shared by every session and
+    survives restarts.
+    """
+
+    DEFAULT_PATH = os.path.join('.cache', 'spec_cache.sqlite3')
+    DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+    DEFAULT_MAX_ENTRIES = 1000
+
+    def __init__(self, path: str = None, ttl_seconds: int = None, max_entries: int = None):
+        self.path = path or SpecCache.DEFAULT_PATH
+        self.ttl_seconds = ttl_seconds or SpecCache.DEFAULT_TTL_SECONDS
+        self.max_entries = max_entries or SpecCache.DEFAULT_MAX_ENTRIES
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS specs (
+                    key TEXT PRIMARY KEY,
+                    spec TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS specs_last_used ON specs (last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the cache safe across threads.
+        # Callers wrap it in closing(); the connection's own context manager
+        # only commits or rolls back and would leave the handle open.
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def normalize_spec_text(spec_text: str) -> str:
+        """Lower-case and collapse whitespace so trivially different prompts share an entry"""
+        return re.sub(r'\s+', ' ', spec_text).strip().lower()
+
+    @staticmethod
+    def column_signature(data: Optional[pd.DataFrame]) -> str:
+        """Describe the dataset's columns and dtypes, independent of column order"""
+        if data is None:
+            return ''
+        return '|'.join(sorted(f"{col}:{dtype}" for col, dtype in data.dtypes.astype(str).items()))
+
+    @staticmethod
+    def make_key(spec_text: str, data: Optional[pd.DataFrame] = None) -> str:
+        raw = SpecCache.normalize_spec_text(spec_text) + '\n' + SpecCache.column_signature(data)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached spec that has not expired, or None"""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT spec FROM specs WHERE key = ? AND created_at > ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE specs SET last_used = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            print(f"Error reading spec cache: {str(e)}")
+            return None
+
+    def put(self, key: str, spec: Dict[str, Any]) -> None:
+        """Store a spec and evict expired and least recently used entries"""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO specs (key, spec, created_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(spec), now, now)
+                )
+                conn.execute("DELETE FROM specs WHERE created_at <= ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    """DELETE FROM specs WHERE key IN (
+                        SELECT key FROM specs ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing spec cache: {str(e)}")
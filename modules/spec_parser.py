@@ -1,17 +1,90 @@
 import json
-from typing import Dict, Any, List
-from .llm_handler import LLMHandler
+import copy
+import math
+import threading
+import pandas as pd
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from .llm_handler import LLMHandler, DEFAULT_DASHBOARD_SPEC, get_llm_handler
+from .spec_cache import SpecCache
+from .heuristic_parser import HeuristicSpecParser
+from .chart_generator import CHART_REGISTRY
+
+# Used when the LLM output cannot be parsed or validated
+DEFAULT_SPEC = {
+    "dashboard_title": "Sample Dashboard",
+    "charts": [
+        {
+            "title": "Sales by Industry",
+            "type": "bar",
+            "x_field": "Industry",
+            "y_field": "Sales",
+            "color_field": "Region",
+            "interactive": True
+        },
+        {
+            "title": "Sales by Region",
+            "type": "pie",
+            "labels_field": "Region",
+            "values_field": "Sales"
+        }
+    ],
+    "layout": {
+        "rows": 2,
+        "columns": 2,
+        "chart_positions": [
+            {"chart": "Sales by Industry", "row": 1, "column": 1},
+            {"chart": "Sales by Region", "row": 1, "column": 2}
+        ]
+    },
+    "filters": ["Industry", "Region"]
+}
+
+_spec_cache = None
+_spec_cache_lock = threading.Lock()
+
+
+def get_spec_cache() -> SpecCache:
+    """Return the spec cache shared by all parsers in this process"""
+    global _spec_cache
+    if _spec_cache is None:
+        with _spec_cache_lock:
+            if _spec_cache is None:
+                _spec_cache = SpecCache()
+    return _spec_cache
+
 
 class ChartSpecParser:
-    def __init__(self):
-        self.llm_handler = LLMHandler()
+    # Local parses at or above this confidence are used without asking the LLM
+    HEURISTIC_MIN_CONFIDENCE = 0.8
+
+    def __init__(self, spec_cache: SpecCache = None, llm_handler: LLMHandler = None):
+        self._llm_handler = llm_handler
+        self.spec_cache = spec_cache or get_spec_cache()
 
-    def parse_specification(self, spec_text: str) -> Dict[str, Any]:
+    @property
+    def llm_handler(self) -> LLMHandler:
+        # Resolved on first use so cache hits never configure the model
+        if self._llm_handler is None:
+            self._llm_handler = get_llm_handler()
+        return self._llm_handler
+
+    def parse_specification(self, spec_text: str, data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Parse natural language specification into structured format"""
+        if data is not None:
+            spec = self._parse_locally(spec_text, data)
+            if spec is not None:
+                return spec
+
+        cache_key = SpecCache.make_key(spec_text, data)
+        cached = self.spec_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        llm_handler = self.llm_handler
         try:
             # Get structured JSON from LLM
-            json_str = self.llm_handler.parse_dashboard_spec(spec_text)
-            
+            json_str = llm_handler.parse_dashboard_spec(spec_text, data)
+
             # If the response is already a dictionary, return it
             if isinstance(json_str, dict):
                 spec = json_str
@@ -21,73 +94,149 @@ class ChartSpecParser:
                     spec = json.loads(json_str)
                 except json.JSONDecodeError:
                     # If JSON parsing fails, use the default specification
-                    spec = {
-                        "dashboard_title": "Sample Dashboard",
-                        "charts": [
-                            {
-                                "title": "Sales by Industry",
-                                "type": "bar",
-                                "x_field": "Industry",
-                                "y_field": "Sales",
-                                "color_field": "Region",
-                                "interactive": True
-                            },
-                            {
-                                "title": "Sales by Region",
-                                "type": "pie",
-                                "labels_field": "Region",
-                                "values_field": "Sales"
-                            }
-                        ],
-                        "layout": {
-                            "rows": 2,
-                            "columns": 2,
-                            "chart_positions": [
-                                {"chart": "Sales by Industry", "row": 1, "column": 1},
-                                {"chart": "Sales by Region", "row": 1, "column": 2}
-                            ]
-                        },
-                        "filters": ["Industry", "Region"]
-                    }
-            
+                    spec = copy.deepcopy(DEFAULT_SPEC)
+
+            self._fill_missing_titles(spec, llm_handler)
+
             # Validate the specification
-            self._validate_spec(spec)
-            
+            self.validate_spec(spec)
+
+            # Fallback specs are not cached so the next attempt asks the model again
+            if spec != DEFAULT_DASHBOARD_SPEC and spec != DEFAULT_SPEC:
+                self.spec_cache.put(cache_key, spec)
+
             return spec
         except Exception as e:
             print(f"Error in specification parsing: {str(e)}")
             # Return a default specification
-            return {
-                "dashboard_title": "Sample Dashboard",
-                "charts": [
-                    {
-                        "title": "Sales by Industry",
-                        "type": "bar",
-                        "x_field": "Industry",
-                        "y_field": "Sales",
-                        "color_field": "Region",
-                        "interactive": True
-                    },
-                    {
-                        "title": "Sales by Region",
-                        "type": "pie",
-                        "labels_field": "Region",
-                        "values_field": "Sales"
-                    }
-                ],
-                "layout": {
-                    "rows": 2,
-                    "columns": 2,
-                    "chart_positions": [
-                        {"chart": "Sales by Industry", "row": 1, "column": 1},
-                        {"chart": "Sales by Region", "row": 1, "column": 2}
-                    ]
-                },
-                "filters": ["Industry", "Region"]
-            }
-
-    def _validate_spec(self, spec: Dict[str, Any]) -> None:
-        """Validate the dashboard specification"""
+            return copy.deepcopy(DEFAULT_SPEC)
+
+    def stream_specification(
+        self,
+        spec_text: str,
+        data: Optional[pd.DataFrame] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yield ('layout', ...) and ('chart', ...) events as soon as each is known.
+
+        Local parses and cache hits are replayed at once; LLM output is parsed
+        incrementally so each chart can be rendered before the model finishes,
+        and the request's token counts and seconds arrive as ('usage', dict).
+        The final event is ('spec', validated_spec). If the LLM stream fails
+        after some charts were streamed, an ('error', message) event is
+        yielded and the final spec holds only those charts; the default spec
+        is used only when nothing was streamed.
+        """
+        spec = self._parse_locally(spec_text, data) if data is not None else None
+        cache_key = SpecCache.make_key(spec_text, data)
+        if spec is None:
+            spec = self.spec_cache.get(cache_key)
+        if spec is not None:
+            yield 'layout', spec['layout']
+            for chart in spec['charts']:
+                yield 'chart', chart
+            yield 'spec', spec
+            return
+
+        llm_handler = self.llm_handler
+        spec = None
+        layout = None
+        streamed = []
+        error = None
+        try:
+            for event, value in llm_handler.stream_dashboard_spec(spec_text, data):
+                if event == 'spec':
+                    spec = value
+                elif event == 'error':
+                    error = value
+                elif event == 'chart':
+                    try:
+                        self._validate_chart_spec(value)
+                    except ValueError as e:
+                        # Untitled or incomplete charts are fixed up in the final spec
+                        print(f"Skipping streamed chart: {str(e)}")
+                        continue
+                    streamed.append(value)
+                    yield event, value
+                else:
+                    # 'layout', or the request's 'usage'
+                    if event == 'layout':
+                        layout = value
+                    yield event, value
+
+            if spec is None:
+                raise ValueError(error or "No specification was returned")
+            self._fill_missing_titles(spec, llm_handler)
+            self.validate_spec(spec)
+            if spec != DEFAULT_DASHBOARD_SPEC and spec != DEFAULT_SPEC:
+                self.spec_cache.put(cache_key, spec)
+        except Exception as e:
+            print(f"Error in specification parsing: {str(e)}")
+            if streamed:
+                # Finish with the charts already on screen rather than mixing in the default spec
+                yield 'error', f"{str(e)}. Showing the {len(streamed)} chart(s) received before the failure."
+                spec = self._partial_spec(layout, streamed)
+            else:
+                spec = copy.deepcopy(DEFAULT_SPEC)
+        yield 'spec', spec
+
+    @staticmethod
+    def _partial_spec(layout: Optional[Dict[str, Any]], charts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a valid spec from the layout and charts streamed before a failure"""
+        layout = layout if isinstance(layout, dict) else {}
+        columns = layout.get('columns')
+        if not isinstance(columns, int) or columns < 1:
+            columns = 2
+        titles = {chart['title'] for chart in charts}
+        positions = [
+            p for p in layout.get('chart_positions') or []
+            if isinstance(p, dict) and p.get('chart') in titles and isinstance(p.get('row'), int)
+        ]
+        rows = max([math.ceil(len(charts) / columns)] + [p['row'] for p in positions])
+        return {
+            "dashboard_title": "Dashboard",
+            "charts": charts,
+            "layout": {"rows": max(1, rows), "columns": columns, "chart_positions": positions},
+            "filters": []
+        }
+
+    @staticmethod
+    def _fill_missing_titles(spec: Dict[str, Any], llm_handler: LLMHandler) -> None:
+        """Title untitled charts with one batched LLM request instead of one call each"""
+        untitled = [
+            chart for chart in spec.get('charts', [])
+            if isinstance(chart, dict) and not chart.get('title') and 'type' in chart
+        ]
+        if not untitled:
+            return
+        requests = [
+            (chart['type'], [str(v) for k, v in chart.items() if k.endswith('_field') and v])
+            for chart in untitled
+        ]
+        # Layout positions refer to charts by title, so an untitled chart's position
+        # (one with the same missing or empty title) is renamed along with it
+        layout = spec.get('layout') if isinstance(spec.get('layout'), dict) else {}
+        positions = [p for p in layout.get('chart_positions') or [] if isinstance(p, dict)]
+        for chart, title in zip(untitled, llm_handler.generate_chart_titles(requests)):
+            old_title = chart.get('title') or None
+            chart['title'] = title
+            position = next((p for p in positions if (p.get('chart') or None) == old_title), None)
+            if position is not None:
+                position['chart'] = title
+
+    def _parse_locally(self, spec_text: str, data: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Return the heuristic parse if it is confident and valid, else None"""
+        try:
+            spec, confidence = HeuristicSpecParser(data).parse(spec_text)
+            if confidence < ChartSpecParser.HEURISTIC_MIN_CONFIDENCE:
+                return None
+            self.validate_spec(spec)
+            return spec
+        except Exception as e:
+            print(f"Error in local specification parsing: {str(e)}")
+            return None
+
+    def validate_spec(self, spec: Dict[str, Any]) -> None:
+        """Validate the dashboard specification, raising ValueError if it is malformed"""
         required_fields = ['dashboard_title', 'charts', 'layout']
         for field in required_fields:
             if field not in spec:
@@ -109,27 +258,10 @@ class ChartSpecParser:
                 raise ValueError(f"Chart missing required field: {field}")
 
         chart_type = chart['type']
-        
-        # Validate based on chart type
-        if chart_type == 'bar':
-            required_fields = ['x_field', 'y_field']
-        elif chart_type == 'pie':
-            required_fields = ['labels_field', 'values_field']
-        elif chart_type == 'line':
-            required_fields = ['x_field', 'y_field']
-        elif chart_type == 'scatter':
-            required_fields = ['x_field', 'y_field']
-        elif chart_type == 'time_series':
-            required_fields = ['time_field', 'value_field']
-        elif chart_type == 'statistics':
-            required_fields = ['value_field']
-        elif chart_type == 'gauge':
-            required_fields = ['value_field']
-        elif chart_type == 'table':
-            required_fields = []  # No required fields for table, columns are optional
-        else:
+        if chart_type not in CHART_REGISTRY:
             raise ValueError(f"Unsupported chart type: {chart_type}")
 
+        required_fields = CHART_REGISTRY[chart_type]['required']
         for field in required_fields:
             if field not in chart:
                 raise ValueError(f"Chart of type '{chart_type}' missing required field: {field}")
@@ -145,4 +277,4 @@ class ChartSpecParser:
             raise ValueError("'rows' must be a positive integer")
 
         if not isinstance(layout['columns'], int) or layout['columns'] < 1:
-            raise ValueError("'columns' must be a positive integer") 
\ No newline at end of file
+            raise ValueError("'columns' must be a positive integer")
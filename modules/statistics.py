@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+# Statistics in the order charts show them
+STATISTICS = ('count', 'mean', 'median', 'min', 'max', 'std')
+
+
+class StatisticsKernel:
+    """Summary statistics for a numeric column, grouped or not, from one kernel.
+
+    Values are converted to a float array once and, when grouped, sorted by
+    group code so each group is a contiguous run. Count, mean, standard
+    deviation, min and max of every run then come from a handful of
+    vectorized ``np.add/minimum/maximum.reduceat`` passes, and quantiles
+    from one ``np.partition`` call per run. An ungrouped column is simply a
+    single run. Above APPROX_THRESHOLD values, a run's quantiles are taken
+    from a fixed-size random sample (min and max stay exact), which keeps the
+    cost bounded for very large columns.
+    """
+
+    APPROX_THRESHOLD = 5_000_000
+    QUANTILE_SAMPLE_SIZE = 200_000
+    SEED = 0
+
+    @staticmethod
+    def _values(series: pd.Series) -> np.ndarray:
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def _quantiles(values: np.ndarray, quantiles: Sequence[float]) -> Dict[float, float]:
+        """Linearly interpolated quantiles from one partition"""
+        n = len(values)
+        positions = {q: q * (n - 1) for q in quantiles}
+        kth = sorted({int(np.floor(p)) for p in positions.values()}
+                     | {int(np.ceil(p)) for p in positions.values()})
+        part = np.partition(values, kth)
+        result = {}
+        for q, p in positions.items():
+            lo, hi = int(np.floor(p)), int(np.ceil(p))
+            result[q] = part[lo] + (part[hi] - part[lo]) * (p - lo)
+        return result
+
+    @staticmethod
+    def _kernel(
+        values: np.ndarray,
+        starts: np.ndarray,
+        quantiles: Sequence[float],
+        approximate: Optional[bool]
+    ) -> Dict[str, np.ndarray]:
+        """Statistics of each run of finite values beginning at starts, one array entry per run"""
+        counts = np.diff(np.append(starts, len(values)))
+        means = np.add.reduceat(values, starts) / counts
+        centered = values - np.repeat(means, counts)
+        squares = np.add.reduceat(centered * centered, starts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+        stats = {
+            'count': counts,
+            'mean': means,
+            'std': std,
+            'min': np.minimum.reduceat(values, starts),
+            'max': np.maximum.reduceat(values, starts)
+        }
+
+        names = {q: StatisticsKernel.quantile_name(q) for q in quantiles}
+        for name in names.values():
+            stats[name] = np.empty(len(starts))
+        if not names:
+            return stats
+        rng = np.random.default_rng(StatisticsKernel.SEED)
+        for i, (start, count) in enumerate(zip(starts, counts)):
+            run = values[start:start + count]
+            sample = approximate if approximate is not None else count > StatisticsKernel.APPROX_THRESHOLD
+            if sample and count > StatisticsKernel.QUANTILE_SAMPLE_SIZE:
+                run = run[rng.choice(count, StatisticsKernel.QUANTILE_SAMPLE_SIZE, replace=False)]
+            for q, value in StatisticsKernel._quantiles(run, quantiles).items():
+                stats[names[q]][i] = value
+        return stats
+
+    @staticmethod
+    def compute(
+        series: pd.Series,
+        quantiles: Sequence[float] = (0.5,),
+        approximate: Optional[bool] = None
+    ) -> Dict[str, float]:
+        """Compute count, mean, std, min, max and the given quantiles of one column.
+
+        Quantiles are keyed as 'median' for 0.5 and 'p<percent>' otherwise.
+        approximate defaults to True above APPROX_THRESHOLD values.
+        """
+        values = StatisticsKernel._values(series)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            stats = {'count': 0, 'mean': np.nan, 'std': np.nan, 'min': np.nan, 'max': np.nan}
+            stats.update({StatisticsKernel.quantile_name(q): np.nan for q in quantiles})
+            return stats
+        stats = StatisticsKernel._kernel(values, np.array([0]), quantiles, approximate)
+        stats = {name: column[0] for name, column in stats.items()}
+        stats['count'] = int(stats['count'])
+        return stats
+
+    @staticmethod
+    def quantile_name(q: float) -> str:
+        return 'median' if q == 0.5 else f"p{q * 100:g}"
+
+    @staticmethod
+    def summarize(
+        data: pd.DataFrame,
+        value_field: str,
+        group_field: str = None,
+        approximate: Optional[bool] = None
+    ) -> pd.DataFrame:
+        """Return one row of STATISTICS per group, or a single row when group_field is None.
+
+        Groups are sorted by key; groups without any finite value are left out.
+        """
+        if not group_field:
+            stats = StatisticsKernel.compute(data[value_field], approximate=approximate)
+            return pd.DataFrame([{name: stats[name] for name in STATISTICS}])
+
+        codes, keys = pd.factorize(data[group_field], sort=True)
+        values = StatisticsKernel._values(data[value_field])
+        keep = (codes >= 0) & np.isfinite(values)
+        codes, values = codes[keep], values[keep]
+        order = np.argsort(codes, kind='stable')
+        codes, values = codes[order], values[order]
+        if len(values) == 0:
+            return pd.DataFrame(columns=[group_field, *STATISTICS])
+
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        stats = StatisticsKernel._kernel(values, starts, (0.5,), approximate)
+        summary = {group_field: keys[codes[starts]]}
+        summary.update({name: stats[name] for name in STATISTICS})
+        return pd.DataFrame(summary)
@@ -0,0 +1,159 @@
+import json
+import hashlib
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from modules.api_source import APIDataSource, SizedLRU
+
+N_RECORDS = 25
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """Paginated JSON API with per-page ETags, served from the class attributes"""
+
+    records = []
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, etag=None, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_page(self, page, extra, headers=None):
+        etag = '"%s"' % hashlib.sha1(json.dumps(page, sort_keys=True).encode()).hexdigest()
+        not_modified = self.headers.get('If-None-Match') == etag
+        StubAPI.requests_seen.append((self.path, 304 if not_modified else 200))
+        if not_modified:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self._send_json(dict(extra, data=page), etag, headers)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == '/offset':
+            offset, limit = int(query['offset']), int(query['limit'])
+            self._send_page(StubAPI.records[offset:offset + limit], {'total': len(StubAPI.records)})
+        elif url.path == '/offset-header':
+            offset, limit = int(query['offset']), int(query['limit'])
+            self._send_page(StubAPI.records[offset:offset + limit], {},
+                            {'X-Total-Count': str(len(StubAPI.records))})
+        elif url.path == '/cursor':
+            start = int(query.get('cursor', 0))
+            end = start + 10
+            self._send_page(StubAPI.records[start:end],
+                            {'next_cursor': str(end) if end < len(StubAPI.records) else None})
+        elif url.path == '/scalars':
+            self._send_json([1, 2, 3])
+        elif url.path == '/missing':
+            self.send_error(404)
+        else:
+            self.send_error(500)
+
+
+class APIDataSourceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPI)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubAPI.records = [{'id': i, 'value': i * 10} for i in range(N_RECORDS)]
+        StubAPI.requests_seen = []
+        self.source = APIDataSource(max_retries=1, backoff_factor=0, max_workers=2)
+
+    def test_offset_pagination_fetches_every_page_in_order(self):
+        frame = self.source.fetch(self.base + '/offset', pagination='offset', page_size=10)
+        self.assertEqual(frame['id'].tolist(), list(range(N_RECORDS)))
+
+    def test_offset_pagination_with_total_in_header(self):
+        frame = self.source.fetch(self.base + '/offset-header', pagination='offset', page_size=10)
+        self.assertEqual(frame['id'].tolist(), list(range(N_RECORDS)))
+
+    def test_cursor_pagination_follows_cursors(self):
+        frame = self.source.fetch(self.base + '/cursor', pagination='cursor')
+        self.assertEqual(frame['id'].tolist(), list(range(N_RECORDS)))
+
+    def test_unchanged_pages_are_revalidated_with_304(self):
+        first = self.source.fetch(self.base + '/offset', pagination='offset', page_size=10)
+        StubAPI.requests_seen = []
+        second = self.source.fetch(self.base + '/offset', pagination='offset', page_size=10)
+        self.assertEqual([status for _, status in StubAPI.requests_seen], [304, 304, 304])
+        self.assertTrue(first.equals(second))
+
+    def test_change_on_a_later_page_is_detected(self):
+        self.source.fetch(self.base + '/offset', pagination='offset', page_size=10)
+        StubAPI.records[22]['value'] = -1
+        StubAPI.requests_seen = []
+        frame = self.source.fetch(self.base + '/offset', pagination='offset', page_size=10)
+        self.assertEqual(sorted(status for _, status in StubAPI.requests_seen), [200, 304, 304])
+        self.assertEqual(frame.loc[frame['id'] == 22, 'value'].item(), -1)
+
+    def test_change_on_a_later_cursor_page_is_detected(self):
+        self.source.fetch(self.base + '/cursor', pagination='cursor')
+        StubAPI.records[15]['value'] = -1
+        frame = self.source.fetch(self.base + '/cursor', pagination='cursor')
+        self.assertEqual(frame.loc[frame['id'] == 15, 'value'].item(), -1)
+
+    def test_page_cache_is_bounded(self):
+        source = APIDataSource(max_retries=1, backoff_factor=0, max_workers=2, max_page_bytes=400)
+        source.fetch(self.base + '/offset', pagination='offset', page_size=10)
+        StubAPI.requests_seen = []
+        frame = source.fetch(self.base + '/offset', pagination='offset', page_size=10)
+        # Evicted pages have no validators left, so they are downloaded again
+        self.assertIn(200, [status for _, status in StubAPI.requests_seen])
+        self.assertEqual(frame['id'].tolist(), list(range(N_RECORDS)))
+
+    def test_http_errors_are_raised(self):
+        with self.assertRaises(requests.HTTPError):
+            self.source.fetch(self.base + '/missing')
+
+    def test_server_errors_are_retried_then_raised(self):
+        with self.assertRaises(requests.exceptions.RetryError):
+            self.source.fetch(self.base + '/broken')
+
+    def test_non_object_records_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Expected JSON objects"):
+            self.source.fetch(self.base + '/scalars')
+
+
+class SizedLRUTest(unittest.TestCase):
+    def test_least_recently_used_entries_are_evicted_over_budget(self):
+        cache = SizedLRU(max_bytes=10)
+        cache.put('a', 1, 4)
+        cache.put('b', 2, 4)
+        cache.get('a')
+        cache.put('c', 3, 4)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+    def test_oversized_entries_are_not_stored(self):
+        cache = SizedLRU(max_bytes=10)
+        cache.put('a', 1, 4)
+        cache.put('a', 2, 11)
+        self.assertIsNone(cache.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
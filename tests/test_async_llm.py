@@ -0,0 +1,126 @@
+import asyncio
+import time
+import unittest
+
+from modules.async_llm import AsyncLLMClient, default_chart_title
+from modules.spec_parser import ChartSpecParser
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeAsyncModel:
+    """Answers each prompt after a delay, recording concurrency and cancellations"""
+
+    def __init__(self, delay=0.05, slow_prompts=(), answer=None):
+        self.delay = delay
+        self.slow_prompts = set(slow_prompts)
+        self.answer = answer
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def generate_content_async(self, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(10 if prompt in self.slow_prompts else self.delay)
+            return FakeResponse(self.answer if self.answer is not None else f"answer to {prompt}")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+class FakeBlockingModel:
+    def generate_content(self, prompt):
+        time.sleep(0.01)
+        return FakeResponse(f"answer to {prompt}")
+
+
+class FakeTitleHandler:
+    def __init__(self, titles):
+        self.titles = titles
+
+    def generate_chart_titles(self, requests):
+        return self.titles[:len(requests)]
+
+
+class AsyncLLMClientTest(unittest.TestCase):
+    def test_calls_run_concurrently_within_the_limit(self):
+        model = FakeAsyncModel()
+        client = AsyncLLMClient(model, max_concurrency=3)
+        prompts = [f"p{i}" for i in range(9)]
+        start = time.perf_counter()
+        results = asyncio.run(client.generate_many(prompts))
+        elapsed = time.perf_counter() - start
+        self.assertEqual(results, [f"answer to {p}" for p in prompts])
+        self.assertEqual(model.max_in_flight, 3)
+        # Three waves of 0.05s rather than nine sequential calls
+        self.assertLess(elapsed, 9 * model.delay)
+
+    def test_timed_out_call_returns_its_error_without_failing_the_rest(self):
+        model = FakeAsyncModel(slow_prompts={"slow"})
+        client = AsyncLLMClient(model, timeout=0.2)
+        start = time.perf_counter()
+        results = asyncio.run(client.generate_many(["fast", "slow"]))
+        self.assertEqual(results[0], "answer to fast")
+        self.assertIsInstance(results[1], asyncio.TimeoutError)
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_cancelling_the_caller_cancels_in_flight_calls(self):
+        model = FakeAsyncModel(slow_prompts={"a", "b", "c"})
+        client = AsyncLLMClient(model, max_concurrency=2)
+
+        async def cancel_soon():
+            task = asyncio.ensure_future(client.generate_many(["a", "b", "c"]))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_soon())
+        self.assertEqual(model.cancelled, 2)
+        self.assertEqual(model.in_flight, 0)
+
+    def test_blocking_models_run_in_the_executor(self):
+        client = AsyncLLMClient(FakeBlockingModel())
+        self.assertEqual(asyncio.run(client.generate_many(["x", "y"])), ["answer to x", "answer to y"])
+
+    def test_titles_fall_back_to_defaults_on_timeout(self):
+        charts = [('bar', ['Sales', 'Region']), ('pie', ['Profit'])]
+        model = FakeAsyncModel(answer='["Sales by Region", "Profit Share"]')
+        titles = asyncio.run(AsyncLLMClient(model).generate_chart_titles(charts))
+        self.assertEqual(titles, ["Sales by Region", "Profit Share"])
+
+        client = AsyncLLMClient(FakeAsyncModel(delay=10), timeout=0.1)
+        titles = asyncio.run(client.generate_chart_titles(charts))
+        self.assertEqual(titles, [default_chart_title(t, f) for t, f in charts])
+
+
+class FillMissingTitlesTest(unittest.TestCase):
+    def test_renamed_charts_keep_their_layout_position(self):
+        spec = {
+            'charts': [
+                {'title': "Sales by Region", 'type': 'bar', 'x_field': 'Region', 'y_field': 'Sales'},
+                {'type': 'pie', 'labels_field': 'Product', 'values_field': 'Profit'},
+                {'title': "", 'type': 'gauge', 'value_field': 'Sales'}
+            ],
+            'layout': {'rows': 2, 'columns': 2, 'chart_positions': [
+                {'chart': "Sales by Region", 'row': 1, 'column': 1},
+                {'row': 1, 'column': 2},
+                {'chart': "", 'row': 2, 'column': 1}
+            ]}
+        }
+        ChartSpecParser._fill_missing_titles(spec, FakeTitleHandler(["Profit by Product", "Total Sales"]))
+        self.assertEqual([c['title'] for c in spec['charts']],
+                         ["Sales by Region", "Profit by Product", "Total Sales"])
+        self.assertEqual([p['chart'] for p in spec['layout']['chart_positions']],
+                         ["Sales by Region", "Profit by Product", "Total Sales"])
+
+
+if __name__ == '__main__':
+    unittest.main()
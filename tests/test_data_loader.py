@@ -0,0 +1,42 @@
+import io
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from modules.data_loader import DataLoader
+
+
+def csv_buffer(df):
+    return io.BytesIO(df.to_csv(index=False).encode('utf-8'))
+
+
+class ChunkedLoadTest(unittest.TestCase):
+    def test_category_codes_that_later_look_numeric(self):
+        n = 100_000
+        df = pd.DataFrame({'code': np.where(np.arange(n) < 20_000, 'A1', '11'), 'value': np.arange(n)})
+        out = DataLoader.load_csv(csv_buffer(df), chunksize=20_000, max_rows=30_000)
+        self.assertEqual(len(out), 30_000)
+        self.assertIsInstance(out['code'].dtype, pd.CategoricalDtype)
+        self.assertEqual(set(out['code'].cat.categories), {'A1', '11'})
+
+    def test_sample_is_uniform_and_summary_is_exact(self):
+        n = 50_000
+        df = pd.DataFrame({'value': np.arange(n)})
+        out = DataLoader.load_csv_chunked(csv_buffer(df), chunksize=3_000, max_rows=5_000)
+        summary = out.attrs['stream_summary']
+        self.assertTrue(summary['sampled'])
+        self.assertEqual((summary['rows'], summary['kept_rows']), (n, 5_000))
+        self.assertEqual(summary['sums']['value'], df['value'].sum())
+        self.assertTrue(out['value'].is_unique)
+        self.assertAlmostEqual(out['value'].mean() / df['value'].mean(), 1, delta=0.05)
+
+    def test_small_file_keeps_every_row(self):
+        df = pd.DataFrame({'value': np.arange(1_000)})
+        out = DataLoader.load_csv_chunked(csv_buffer(df), chunksize=300, max_rows=5_000)
+        self.assertFalse(out.attrs['stream_summary']['sampled'])
+        self.assertEqual(out['value'].tolist(), df['value'].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from modules.heuristic_parser import HeuristicSpecParser, PARTIAL_CONFIDENCE
+from modules.sample_data import generate_sample_data
+
+
+class HeuristicSpecParserTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = HeuristicSpecParser(generate_sample_data(1000))
+
+    def assertPartial(self, prompt):
+        _, confidence = self.parser.parse(prompt)
+        self.assertLessEqual(confidence, PARTIAL_CONFIDENCE, prompt)
+
+    def test_fully_used_prompts_are_confident(self):
+        spec, confidence = self.parser.parse("bar chart of Sales by Region")
+        self.assertEqual(confidence, 1.0)
+        self.assertEqual(spec['charts'], [{
+            'type': 'bar', 'x_field': 'Region', 'y_field': 'Sales', 'title': "Sales by Region"
+        }])
+
+    def test_second_dimension_becomes_the_bar_color(self):
+        spec, confidence = self.parser.parse("bar chart of Sales by Region and Industry")
+        self.assertEqual(confidence, 1.0)
+        self.assertEqual(spec['charts'][0]['color_field'], 'Industry')
+
+    def test_unused_dimension_lowers_confidence(self):
+        self.assertPartial("pie chart of Sales by Region and Industry")
+        self.assertPartial("bar chart of Sales by Region and Industry by Product")
+
+    def test_unused_measure_lowers_confidence(self):
+        self.assertPartial("gauge of Sales and Profit")
+        self.assertPartial("bar chart of Sales and Profit by Region")
+
+    def test_unparsed_words_lower_confidence(self):
+        self.assertPartial("bar chart of the top 5 Sales by Region")
+        self.assertPartial("heatmap of Sales by Region, pie chart of Sales by Industry")
+
+
+if __name__ == '__main__':
+    unittest.main()
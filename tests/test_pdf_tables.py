@@ -0,0 +1,31 @@
+import unittest
+
+from modules.pdf_tables import PDFTableExtractor
+
+PAGE = """Quarterly results
+Product Q1 Q2 Q3
+Widgets 10 20 30
+Gadgets 1,200 5 (3)
+Bolts 4 5 6
+Some footer text here
+"""
+
+
+class DetectTablesTest(unittest.TestCase):
+    def test_prose_after_a_table_is_not_a_row(self):
+        tables = PDFTableExtractor.detect_tables(PAGE)
+        self.assertEqual(len(tables), 1)
+        self.assertEqual(tables[0][0], ['Product', 'Q1', 'Q2', 'Q3'])
+        self.assertEqual(tables[0][-1], ['Bolts', '4', '5', '6'])
+
+        df = PDFTableExtractor.stitch_tables(tables)[0]
+        self.assertEqual(df['Q1'].tolist(), [10, 1200, 4])
+        self.assertEqual(df['Q3'].tolist(), [30, -3, 6])
+
+    def test_text_rows_with_column_gaps_are_kept(self):
+        tables = PDFTableExtractor.detect_tables("Name  City\nAnn  Paris\nBob  Rome\nCy  Oslo")
+        self.assertEqual(tables, [[['Name', 'City'], ['Ann', 'Paris'], ['Bob', 'Rome'], ['Cy', 'Oslo']]])
+
+
+if __name__ == '__main__':
+    unittest.main()
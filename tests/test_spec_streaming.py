@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from modules import llm_handler
+from modules.spec_cache import SpecCache
+from modules.spec_parser import ChartSpecParser, DEFAULT_SPEC
+
+# Chunks as the model streamed them for "sales by region and profit by product",
+# including the Markdown fence the model wraps its JSON in
+RECORDED_CHUNKS = [
+    '```json\n{\n  "dashboard_title": "Sales Over',
+    'view",\n  "layout": {"rows": 1, "columns": 2, "chart_positions": [{"chart": "Sales by Re',
+    'gion", "row": 1, "column": 1}, {"chart": "Profit by Product", "row": 1, "column": 2}]},\n',
+    '  "charts": [\n    {"title": "Sales by Region", "type": "bar", "x_fie',
+    'ld": "Region", "y_field": "Sales"},\n    {"title": "Profit by Product", "type": "pie", ',
+    '"labels_field": "Product", "values_field": "Profit"}\n  ],\n  "filters": ["Region"]\n}\n```'
+]
+
+
+class FakeChunk:
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeUsage:
+    prompt_token_count = 812
+    candidates_token_count = 164
+
+
+class FakeModel:
+    """Replays recorded chunks, optionally failing after fail_after chunks"""
+
+    def __init__(self, chunks, fail_after=None, usage_metadata=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.usage_metadata = usage_metadata
+
+    def generate_content(self, prompt, stream=False):
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise ConnectionError("stream reset")
+            last = i == len(self.chunks) - 1
+            yield FakeChunk(chunk, self.usage_metadata if last else None)
+
+
+class StreamSpecificationTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        with mock.patch.dict(os.environ, {'GOOGLE_API_KEY': 'test'}), \
+                mock.patch.object(llm_handler, 'genai'):
+            self.handler = llm_handler.LLMHandler()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def stream(self, model):
+        self.handler.model = model
+        cache = SpecCache(os.path.join(self.cache_dir, 'specs.sqlite3'))
+        parser = ChartSpecParser(spec_cache=cache, llm_handler=self.handler)
+        return list(parser.stream_specification("sales by region and profit by product"))
+
+    def test_complete_stream_yields_layout_charts_then_spec(self):
+        events = self.stream(FakeModel(RECORDED_CHUNKS))
+        self.assertEqual([event for event, _ in events], ['layout', 'chart', 'chart', 'usage', 'spec'])
+        usage = events[3][1]
+        self.assertTrue(usage['estimated'])
+        self.assertGreater(usage['prompt_tokens'], 0)
+        self.assertGreater(usage['response_tokens'], 0)
+        self.assertGreaterEqual(usage['seconds'], 0)
+        spec = events[-1][1]
+        self.assertEqual(spec['dashboard_title'], "Sales Overview")
+        self.assertEqual([c['title'] for c in spec['charts']], ["Sales by Region", "Profit by Product"])
+
+    def test_reported_token_counts_are_used(self):
+        events = dict(self.stream(FakeModel(RECORDED_CHUNKS, usage_metadata=FakeUsage())))
+        self.assertEqual(
+            {key: events['usage'][key] for key in ('prompt_tokens', 'response_tokens', 'estimated')},
+            {'prompt_tokens': 812, 'response_tokens': 164, 'estimated': False}
+        )
+
+    def test_charts_are_yielded_before_the_stream_ends(self):
+        self.handler.model = FakeModel(RECORDED_CHUNKS)
+        cache = SpecCache(os.path.join(self.cache_dir, 'specs.sqlite3'))
+        parser = ChartSpecParser(spec_cache=cache, llm_handler=self.handler)
+        stream = parser.stream_specification("sales by region and profit by product")
+        self.assertEqual(next(stream)[0], 'layout')
+        event, chart = next(stream)
+        self.assertEqual((event, chart['title']), ('chart', "Sales by Region"))
+
+    def test_failure_midway_keeps_only_streamed_charts(self):
+        events = self.stream(FakeModel(RECORDED_CHUNKS, fail_after=5))
+        self.assertEqual([event for event, _ in events], ['layout', 'chart', 'error', 'spec'])
+        spec = events[-1][1]
+        self.assertEqual([c['title'] for c in spec['charts']], ["Sales by Region"])
+        self.assertEqual(spec['layout']['chart_positions'],
+                         [{"chart": "Sales by Region", "row": 1, "column": 1}])
+        # The default spec's charts are not mixed into the partial dashboard
+        self.assertNotIn("Sales by Industry", [c['title'] for c in spec['charts']])
+
+    def test_truncated_response_keeps_only_streamed_charts(self):
+        events = self.stream(FakeModel(RECORDED_CHUNKS[:5]))
+        self.assertEqual([event for event, _ in events], ['layout', 'chart', 'usage', 'error', 'spec'])
+        self.assertEqual([c['title'] for c in events[-1][1]['charts']], ["Sales by Region"])
+
+    def test_failure_before_any_chart_falls_back_to_default_spec(self):
+        events = self.stream(FakeModel(RECORDED_CHUNKS, fail_after=1))
+        self.assertEqual([event for event, _ in events], ['spec'])
+        self.assertEqual(events[-1][1], DEFAULT_SPEC)
+
+
+if __name__ == '__main__':
+    unittest.main()